@@ -1,7 +1,7 @@
 """Crew.ai Agents for Report Generation (Executor)"""
 
 import logging
-from app.config import llm
+from app.config import get_llm
 
 logger = logging.getLogger(__name__)
 
@@ -19,7 +19,7 @@ def get_compliance_analyst_agent():
         role="Compliance Analyst",
         goal="Analyze compliance alerts and extract key information for report generation",
         backstory="Expert compliance analyst with 10+ years in fintech regulations",
-        llm=llm,
+        llm=get_llm(),
         verbose=True,
     )
 
@@ -29,7 +29,7 @@ def get_company_data_fetcher_agent():
     Creates the Company Data Fetcher agent for Executor.
     
     This agent retrieves company metadata and data locations for compliance reporting.
-    In a real implementation, this would connect to actual data sources.
+    It only runs when no company data provider has structured data for the company.
     """
     from crew import Agent
     
@@ -37,7 +37,7 @@ def get_company_data_fetcher_agent():
         role="Company Data Fetcher",
         goal="Retrieve company metadata and data locations for compliance reporting",
         backstory="Data architect familiar with cloud infrastructure and data governance",
-        llm=llm,
+        llm=get_llm(),
         verbose=True,
     )
 
@@ -54,42 +54,83 @@ def get_report_writer_agent():
         role="Compliance Report Writer",
         goal="Write comprehensive, professional compliance reports in Markdown",
         backstory="Technical writer specializing in compliance and regulatory documentation",
-        llm=llm,
+        llm=get_llm(),
         verbose=True,
     )
 
 
-def generate_mock_executor_report(alert, company_data: dict) -> str:
+# Report sections, in document order: (key, title)
+REPORT_SECTIONS = (
+    ("executive_summary", "Executive Summary"),
+    ("findings", "Compliance Findings"),
+    ("risk", "Risk Assessment"),
+    ("recommendations", "Recommendations"),
+)
+
+
+def assemble_report(sections: dict, mock: bool = False) -> str:
     """
-    Generates a realistic mock Markdown report when API is unavailable.
+    Joins section Markdown (keyed by section key) into the full report.
     
     Args:
-        alert: ComplianceAlert database object
-        company_data: Dictionary with company information
+        sections: Section key -> Markdown starting with its "## Title" heading
+        mock: Whether the report was produced without the LLM
     
     Returns:
         Markdown-formatted compliance report string
     """
     from datetime import datetime
     
+    body = "\n\n".join(sections[key].strip() for key, _ in REPORT_SECTIONS if key in sections)
+    footer = "*Report generated by CompliOps Executor*"
+    if mock:
+        footer += "\n*Mock Report (No API Key)*"
     return f"""# Compliance Report
 
-## Executive Summary
+*Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*
+
+{body}
+
+## Conclusion
+
+This report has been automatically generated based on detected compliance alerts. 
+All recommendations should be reviewed by your compliance team and implemented per your organization's change management procedures.
+
+---
+{footer}
+"""
+
+
+def generate_mock_section(key: str, alert, company_data: dict) -> str:
+    """
+    Generates one realistic mock report section when API is unavailable.
+    
+    Args:
+        key: Section key from REPORT_SECTIONS
+        alert: ComplianceAlert database object
+        company_data: Dictionary with company information
+    
+    Returns:
+        Markdown for the section, starting with its "## Title" heading
+    """
+    impact = alert.impact_json.get('impact', 'Medium')
+    
+    if key == "executive_summary":
+        return f"""## Executive Summary
 
 This report addresses the compliance alert: **{alert.summary}**
 
 ### Impact Assessment
-- **Severity Level**: {alert.impact_json.get('impact', 'Medium')}
+- **Severity Level**: {impact}
 - **Status**: Action Required
-- **Generated**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-## Company Details
 
+### Company Details
 - **Organization**: {company_data.get('company_name', 'N/A')}
 - **User Base**: {company_data.get('user_count', 'N/A')} users
-- **Data Locations**: {', '.join(company_data.get('data_locations', ['N/A']))}
-
-## Compliance Findings
+- **Data Locations**: {', '.join(company_data.get('data_locations', ['N/A']))}"""
+    
+    if key == "findings":
+        return f"""## Compliance Findings
 
 ### Alert Details
 {alert.summary}
@@ -98,14 +139,18 @@ This report addresses the compliance alert: **{alert.summary}**
 1. Review current compliance posture against new requirements
 2. Update data residency and processing agreements if necessary
 3. Conduct internal training for relevant teams
-4. Document changes in compliance tracking system
-
-### Risk Assessment
-**Current Risk Level**: Medium-High
+4. Document changes in compliance tracking system"""
+    
+    if key == "risk":
+        risk_level = {"High": "High", "Low": "Low-Medium"}.get(impact, "Medium-High")
+        return f"""## Risk Assessment
 
-This alert requires immediate attention to ensure ongoing regulatory compliance and operational continuity.
+**Current Risk Level**: {risk_level}
 
-### Recommendations
+This alert affects {company_data.get('user_count', 'N/A')} users with data in {', '.join(company_data.get('data_locations', ['N/A']))} and requires immediate attention to ensure ongoing regulatory compliance and operational continuity."""
+    
+    if key == "recommendations":
+        return """## Recommendations
 
 1. **Immediate (0-7 days)**
    - Conduct thorough compliance audit
@@ -120,14 +165,21 @@ This alert requires immediate attention to ensure ongoing regulatory compliance
 3. **Follow-up (30+ days)**
    - Verify compliance through testing
    - Conduct regulatory reporting if required
-   - Schedule follow-up audit
-
-## Conclusion
+   - Schedule follow-up audit"""
+    
+    raise ValueError(f"Unknown report section: {key}")
 
-This report has been automatically generated based on detected compliance alerts. 
-All recommendations should be reviewed by your compliance team and implemented per your organization's change management procedures.
 
----
-*Report generated by CompliOps Executor*
-*Mock Report (No API Key)*
-"""
+def generate_mock_executor_report(alert, company_data: dict) -> str:
+    """
+    Generates a realistic mock Markdown report when API is unavailable.
+    
+    Args:
+        alert: ComplianceAlert database object
+        company_data: Dictionary with company information
+    
+    Returns:
+        Markdown-formatted compliance report string
+    """
+    sections = {key: generate_mock_section(key, alert, company_data) for key, _ in REPORT_SECTIONS}
+    return assemble_report(sections, mock=True)
@@ -2,6 +2,8 @@
 
 import os
 import logging
+import secrets
+import threading
 
 logger = logging.getLogger(__name__)
 
@@ -11,23 +13,205 @@ logger = logging.getLogger(__name__)
 
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
-# Initialize Gemini LLM only if API key exists
-llm = None
-if GEMINI_API_KEY:
-    try:
-        from langchain_google_genai import ChatGoogleGenerativeAI
-        llm = ChatGoogleGenerativeAI(
-            model="gemini-1.5-pro-latest",
-            google_api_key=GEMINI_API_KEY,
-            temperature=0.7,
-        )
-        logger.info("✓ Gemini API initialized successfully")
-    except Exception as e:
-        logger.warning(f"⚠ Failed to initialize Gemini API: {e}")
-        llm = None
-else:
+if not GEMINI_API_KEY:
     logger.warning("⚠ GEMINI_API_KEY not set. Running in MOCK mode.")
 
+# Shared Gemini client, built lazily by get_llm() on first use
+_llm = None
+_llm_init_attempted = False
+_llm_lock = threading.Lock()
+
+
+def get_llm():
+    """
+    Returns the shared Gemini LLM client, building it on first use.
+    
+    The langchain import and client construction are deferred so that
+    importing the app (and forking workers) stays cheap.
+    
+    Returns:
+        ChatGoogleGenerativeAI instance, or None in mock mode / on init failure
+    """
+    global _llm, _llm_init_attempted
+    
+    if _llm_init_attempted:
+        return _llm
+    
+    with _llm_lock:
+        if _llm_init_attempted:
+            return _llm
+        
+        if GEMINI_API_KEY:
+            try:
+                from langchain_google_genai import ChatGoogleGenerativeAI
+                _llm = ChatGoogleGenerativeAI(
+                    model="gemini-1.5-pro-latest",
+                    google_api_key=GEMINI_API_KEY,
+                    temperature=0.7,
+                )
+                logger.info("✓ Gemini API initialized successfully")
+            except Exception as e:
+                logger.warning(f"⚠ Failed to initialize Gemini API: {e}")
+                _llm = None
+        
+        _llm_init_attempted = True
+        return _llm
+
+
+# ============================================================================
+# AUTHENTICATION
+# ============================================================================
+
+JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
+JWT_ALGORITHM = "HS256"
+JWT_EXPIRE_MINUTES = int(os.getenv("JWT_EXPIRE_MINUTES", "60"))
+
+# Accounts allowed to use /api/v1/admin (comma-separated emails); anyone can
+# register, so admin endpoints are closed to everyone when this is empty
+ADMIN_EMAILS = frozenset(
+    email.strip().lower() for email in os.getenv("ADMIN_EMAILS", "").split(",") if email.strip()
+)
+
+# PBKDF2 work factor for password hashing
+PASSWORD_HASH_ITERATIONS = int(os.getenv("PASSWORD_HASH_ITERATIONS", "200000"))
+
+if not JWT_SECRET_KEY:
+    # Tokens will not survive restarts or be shared across workers
+    JWT_SECRET_KEY = secrets.token_urlsafe(32)
+    logger.warning("⚠ JWT_SECRET_KEY not set. Using a random per-process secret.")
+
+
+# ============================================================================
+# RATE LIMITING & LLM BUDGETS
+# ============================================================================
+
+# Largest batch accepted by POST /reports/generate/batch
+REPORT_BATCH_MAX_ITEMS = 50
+
+# Token-bucket limits per user and route: (requests per minute, burst capacity)
+RATE_LIMITS = {
+    "chat": (int(os.getenv("RATE_LIMIT_CHAT_PER_MINUTE", "30")), int(os.getenv("RATE_LIMIT_CHAT_BURST", "10"))),
+    "reports_generate": (
+        int(os.getenv("RATE_LIMIT_REPORTS_PER_MINUTE", "5")),
+        int(os.getenv("RATE_LIMIT_REPORTS_BURST", "2")),
+    ),
+    # Charged per report in a batch; the burst admits one maximum-size batch
+    "reports_generate_batch": (
+        int(os.getenv("RATE_LIMIT_REPORT_BATCH_PER_MINUTE", "25")),
+        int(os.getenv("RATE_LIMIT_REPORT_BATCH_BURST", str(REPORT_BATCH_MAX_ITEMS))),
+    ),
+}
+
+# Daily LLM token budget (prompt + completion) per tenant
+DAILY_TOKEN_BUDGET = int(os.getenv("DAILY_TOKEN_BUDGET", "200000"))
+
+# Requests needing the LLM are rejected with 429 once this many LLM calls are in flight
+LLM_MAX_INFLIGHT = int(os.getenv("LLM_MAX_INFLIGHT", "16"))
+
+# "memory" (single worker) or "redis" (shared across workers, needs REDIS_URL)
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+
+# ============================================================================
+# LLM CIRCUIT BREAKER & HEDGING
+# ============================================================================
+
+# Open the circuit when at least this share of recent calls failed...
+LLM_BREAKER_FAILURE_RATE = float(os.getenv("LLM_BREAKER_FAILURE_RATE", "0.5"))
+# ...out of at least this many calls in the sliding window
+LLM_BREAKER_MIN_CALLS = int(os.getenv("LLM_BREAKER_MIN_CALLS", "5"))
+LLM_BREAKER_WINDOW_SECONDS = float(os.getenv("LLM_BREAKER_WINDOW_SECONDS", "60"))
+# How long the circuit stays open before a half-open probe is allowed
+LLM_BREAKER_OPEN_SECONDS = float(os.getenv("LLM_BREAKER_OPEN_SECONDS", "30"))
+
+# Send a duplicate LLM request if the first has not answered after this many ms (0 = off)
+LLM_HEDGE_AFTER_MS = float(os.getenv("LLM_HEDGE_AFTER_MS", "0"))
+
+
+# ============================================================================
+# KNOWLEDGE BASE (RAG Corpus)
+# ============================================================================
+
+# Root directory that the ingestion endpoint is allowed to read from
+KNOWLEDGE_BASE_DIR = os.getenv("KNOWLEDGE_BASE_DIR", "./knowledge_base")
+
+# "hashing" (local, no API calls) or "gemini" (text-embedding-004 via langchain)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "hashing")
+EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", "256"))
+
+# Chunking: target characters per chunk and overlap between consecutive chunks
+CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", "1200"))
+CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", "200"))
+
+# How often each worker checks whether the knowledge base changed (e.g. after
+# another worker ingested) and reloads its in-memory index
+KNOWLEDGE_INDEX_CHECK_SECONDS = float(os.getenv("KNOWLEDGE_INDEX_CHECK_SECONDS", "30"))
+
+
+# ============================================================================
+# DASHBOARD STATS
+# ============================================================================
+
+# Seconds /stats responses are served from memory before re-reading the aggregate tables
+STATS_CACHE_TTL = float(os.getenv("STATS_CACHE_TTL", "10"))
+
+
+# ============================================================================
+# HTTP RESPONSE CACHING
+# ============================================================================
+
+# Serialized alert/report bodies kept in memory for GET-by-id
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "2048"))
+# Cache-Control max-age (seconds) for immutable resources (alerts, completed reports)
+RESPONSE_CACHE_MAX_AGE = int(os.getenv("RESPONSE_CACHE_MAX_AGE", "300"))
+
+
+# ============================================================================
+# DATA RETENTION
+# ============================================================================
+
+# Rows older than `days` (0 disables) matching the filters are moved to the
+# compressed archive tables. Alerts are archived by age alone (nothing marks
+# an alert actioned yet; set ALERT_RETENTION_INCLUDE_OPEN=false to keep alerts
+# with action_required); in-progress reports are always kept.
+RETENTION_POLICIES = {
+    "alerts": {
+        "days": int(os.getenv("ALERT_RETENTION_DAYS", "90")),
+        "include_open": os.getenv("ALERT_RETENTION_INCLUDE_OPEN", "true").lower() == "true",
+    },
+    "reports": {
+        "days": int(os.getenv("REPORT_RETENTION_DAYS", "180")),
+        "statuses": tuple(os.getenv("REPORT_RETENTION_STATUSES", "completed,failed").split(",")),
+    },
+}
+# Rows moved per transaction (keeps write locks short)
+RETENTION_BATCH_SIZE = int(os.getenv("RETENTION_BATCH_SIZE", "500"))
+# How often the scheduler runs archival + compaction
+RETENTION_INTERVAL_HOURS = float(os.getenv("RETENTION_INTERVAL_HOURS", "24"))
+# Free pages reclaimed per incremental-vacuum step (SQLite)
+RETENTION_VACUUM_PAGES = int(os.getenv("RETENTION_VACUUM_PAGES", "1000"))
+
+
+# ============================================================================
+# COMPANY DATA (Executor report inputs)
+# ============================================================================
+
+# "static" (DEFAULT_COMPANY_DATA), "json" (file of company_id -> record) or "sqlite"
+COMPANY_DATA_BACKEND = os.getenv("COMPANY_DATA_BACKEND", "static")
+COMPANY_DATA_PATH = os.getenv("COMPANY_DATA_PATH", "./company_data.json")
+# Company reports are generated for when the request does not name one
+COMPANY_ID = os.getenv("COMPANY_ID", "default")
+# Seconds a fetched company record is reused before asking the backend again
+COMPANY_DATA_CACHE_TTL = float(os.getenv("COMPANY_DATA_CACHE_TTL", "300"))
+
+# Stand-in record served by the static backend
+DEFAULT_COMPANY_DATA = {
+    "company_name": "Startup Inc.",
+    "data_locations": ["aws-uae-north-1", "gcp-dammam"],
+    "user_count": 45000,
+}
+
 
 # ============================================================================
 # MOCK DATA STORE (For RAG Chat)
@@ -57,3 +241,17 @@ mock_vector_store = {
         "Threshold: transactions above AED 500,000 require enhanced due diligence."
     ),
 }
+
+
+# ============================================================================
+# PROFILING
+# ============================================================================
+
+# Fraction of requests (0.0 - 1.0) profiled without an explicit X-Profile header
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+
+# Profiled requests slower than this are kept in the slow-request buffer
+PROFILE_SLOW_MS = float(os.getenv("PROFILE_SLOW_MS", "500"))
+
+# Maximum number of slow-request profiles kept in memory
+PROFILE_BUFFER_SIZE = int(os.getenv("PROFILE_BUFFER_SIZE", "100"))
@@ -1,12 +1,38 @@
 """Database models and Pydantic schemas"""
-from app.models.database import Base, User, ComplianceAlert, GeneratedReport, engine, SessionLocal
+from app.models.database import (
+    Base,
+    User,
+    ComplianceAlert,
+    GeneratedReport,
+    ReportSection,
+    KnowledgeDocument,
+    KnowledgeChunk,
+    AlertStatsBucket,
+    ReportStatsBucket,
+    ArchivedAlert,
+    ArchivedReport,
+    engine,
+    SessionLocal,
+    init_db,
+)
 from app.models.schemas import (
     LoginRequest,
     LoginResponse,
+    UserResponse,
     ComplianceAlertResponse,
     GeneratedReportResponse,
+    ReportSectionResponse,
+    ReportBatchItem,
+    ReportBatchRequest,
     ChatRequest,
     ChatResponse,
+    IngestRequest,
+    SearchResult,
+    SearchResponse,
+    AlertStats,
+    ReportStats,
+    StatsTrendPoint,
+    StatsResponse,
 )
 
 __all__ = [
@@ -14,12 +40,31 @@ __all__ = [
     "User",
     "ComplianceAlert",
     "GeneratedReport",
+    "ReportSection",
+    "KnowledgeDocument",
+    "KnowledgeChunk",
+    "AlertStatsBucket",
+    "ReportStatsBucket",
+    "ArchivedAlert",
+    "ArchivedReport",
     "engine",
     "SessionLocal",
+    "init_db",
     "LoginRequest",
     "LoginResponse",
+    "UserResponse",
     "ComplianceAlertResponse",
     "GeneratedReportResponse",
+    "ReportSectionResponse",
+    "ReportBatchItem",
+    "ReportBatchRequest",
     "ChatRequest",
     "ChatResponse",
+    "IngestRequest",
+    "SearchResult",
+    "SearchResponse",
+    "AlertStats",
+    "ReportStats",
+    "StatsTrendPoint",
+    "StatsResponse",
 ]
@@ -1,7 +1,21 @@
 """SQLAlchemy Database Models and Configuration"""
 
+import os
+import logging
 from datetime import datetime
-from sqlalchemy import create_engine, Column, String, DateTime, Integer, JSON, Boolean
+from sqlalchemy import (
+    create_engine,
+    Column,
+    String,
+    DateTime,
+    Integer,
+    JSON,
+    Boolean,
+    LargeBinary,
+    Text,
+    UniqueConstraint,
+    event,
+)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -9,11 +23,24 @@ from sqlalchemy.orm import sessionmaker
 # DATABASE SETUP
 # ============================================================================
 
-DATABASE_URL = "sqlite:///./complios.db"
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+logger = logging.getLogger(__name__)
+
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./complios.db")
+engine = create_engine(
+    DATABASE_URL,
+    connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {},
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        # Lets retention reclaim space with PRAGMA incremental_vacuum instead of
+        # a full VACUUM. Takes effect on new databases (before the first table
+        # is created); existing files need one `VACUUM` to switch over.
+        dbapi_connection.execute("PRAGMA auto_vacuum = INCREMENTAL")
+
 
 # ============================================================================
 # DATABASE MODELS
@@ -32,11 +59,16 @@ class User(Base):
 class ComplianceAlert(Base):
     """Stores compliance alerts detected by Watchtower."""
     __tablename__ = "compliance_alerts"
+    # Never reuse ids: archived alerts keep theirs (see ArchivedAlert)
+    __table_args__ = {"sqlite_autoincrement": True}
     
     id = Column(Integer, primary_key=True, index=True)
     source = Column(String, default="watchtower")
     summary = Column(String)
     impact_json = Column(JSON)  # Stores analysis as JSON
+    # Text values of impact_json (actions, analysis, ...) for full-text search;
+    # maintained by app.services.search
+    analysis_text = Column(Text)
     action_required = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
@@ -44,6 +76,8 @@ class ComplianceAlert(Base):
 class GeneratedReport(Base):
     """Stores reports generated by the Executor."""
     __tablename__ = "generated_reports"
+    # Never reuse ids: archived reports keep theirs (see ArchivedReport)
+    __table_args__ = {"sqlite_autoincrement": True}
     
     id = Column(Integer, primary_key=True, index=True)
     alert_id = Column(Integer, index=True)
@@ -53,5 +87,112 @@ class GeneratedReport(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
 
-# Create all tables on startup
-Base.metadata.create_all(bind=engine)
+class ReportSection(Base):
+    """
+    One addressable section of a GeneratedReport.
+    
+    input_hash covers exactly the inputs the section was generated from, so
+    later reports with the same inputs reuse the content instead of calling
+    the LLM again.
+    """
+    __tablename__ = "report_sections"
+    __table_args__ = (UniqueConstraint("report_id", "key"),)
+    
+    id = Column(Integer, primary_key=True, index=True)
+    report_id = Column(Integer, index=True)
+    key = Column(String, nullable=False)  # executive_summary, findings, risk, recommendations
+    position = Column(Integer, default=0)
+    title = Column(String)
+    input_hash = Column(String(64), index=True)
+    content = Column(Text)
+    reused = Column(Boolean, default=False)  # copied from an earlier report with the same inputs
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class KnowledgeDocument(Base):
+    """A source file ingested into the RAG knowledge base."""
+    __tablename__ = "knowledge_documents"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    path = Column(String, unique=True, index=True)
+    content_hash = Column(String(64))  # sha256 of the raw file bytes
+    chunk_count = Column(Integer, default=0)
+    ingested_at = Column(DateTime, default=datetime.utcnow)
+
+
+class KnowledgeChunk(Base):
+    """A chunk of a KnowledgeDocument with its embedding."""
+    __tablename__ = "knowledge_chunks"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    document_id = Column(Integer, index=True)
+    chunk_index = Column(Integer)
+    content_hash = Column(String(64), index=True)  # sha256 of the chunk text
+    text = Column(Text)
+    embedding = Column(LargeBinary)  # float32 array bytes
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class AlertStatsBucket(Base):
+    """Alert counts per time bucket, impact level and open/actioned state (maintained incrementally)."""
+    __tablename__ = "alert_stats_buckets"
+    __table_args__ = (UniqueConstraint("granularity", "bucket_start", "impact", "action_required"),)
+    
+    id = Column(Integer, primary_key=True)
+    granularity = Column(String, nullable=False)  # hour, day
+    bucket_start = Column(DateTime, nullable=False, index=True)
+    impact = Column(String, nullable=False)
+    action_required = Column(Boolean, nullable=False)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class ReportStatsBucket(Base):
+    """Report counts per time bucket and status (maintained incrementally)."""
+    __tablename__ = "report_stats_buckets"
+    __table_args__ = (UniqueConstraint("granularity", "bucket_start", "status"),)
+    
+    id = Column(Integer, primary_key=True)
+    granularity = Column(String, nullable=False)  # hour, day
+    bucket_start = Column(DateTime, nullable=False, index=True)
+    status = Column(String, nullable=False)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class ArchivedAlert(Base):
+    """A ComplianceAlert moved out of the live table by the retention policy."""
+    __tablename__ = "archived_alerts"
+    
+    id = Column(Integer, primary_key=True, autoincrement=False)  # original alert id
+    impact = Column(String, index=True)
+    action_required = Column(Boolean)
+    created_at = Column(DateTime, index=True)
+    archived_at = Column(DateTime, default=datetime.utcnow)
+    payload = Column(LargeBinary)  # zlib-compressed JSON of the full alert
+
+
+class ArchivedReport(Base):
+    """A GeneratedReport moved out of the live table by the retention policy."""
+    __tablename__ = "archived_reports"
+    
+    id = Column(Integer, primary_key=True, autoincrement=False)  # original report id
+    alert_id = Column(Integer, index=True)
+    status = Column(String)
+    created_at = Column(DateTime, index=True)
+    archived_at = Column(DateTime, default=datetime.utcnow)
+    payload = Column(LargeBinary)  # zlib-compressed JSON of the full report
+
+
+# ============================================================================
+# SCHEMA INITIALIZATION
+# ============================================================================
+
+def init_db():
+    """
+    Creates all tables that do not exist yet.
+    
+    Called explicitly from the application lifespan (and from CLI entry
+    points) rather than at import time, so importing the models never
+    touches the database.
+    """
+    Base.metadata.create_all(bind=engine)
+    logger.info("✓ Database schema ready")
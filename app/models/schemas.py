@@ -1,19 +1,29 @@
 """Pydantic Request/Response Models for API"""
 
 from datetime import datetime
+from typing import Dict, List, Optional
 from pydantic import BaseModel, Field
 
+from app.config import REPORT_BATCH_MAX_ITEMS
+
 
 class LoginRequest(BaseModel):
-    """Dummy login request."""
+    """Login / registration request."""
     email: str
     password: str
 
 
 class LoginResponse(BaseModel):
-    """Mock JWT token response."""
-    access_token: str = Field(..., description="Mock JWT token")
+    """Signed JWT token response."""
+    access_token: str = Field(..., description="Signed JWT (HS256) access token")
     token_type: str = "bearer"
+    expires_in: int = Field(..., description="Token lifetime in seconds")
+
+
+class UserResponse(BaseModel):
+    """Authenticated user (also returned on registration)."""
+    id: int
+    email: str
 
 
 class ComplianceAlertResponse(BaseModel):
@@ -42,6 +52,32 @@ class GeneratedReportResponse(BaseModel):
         from_attributes = True
 
 
+class ReportBatchItem(BaseModel):
+    """One report to generate in a batch."""
+    alert_id: int
+    company_id: Optional[str] = Field(None, description="Defaults to COMPANY_ID")
+
+
+class ReportBatchRequest(BaseModel):
+    """Request model for batch report generation."""
+    items: List[ReportBatchItem] = Field(..., min_length=1, max_length=REPORT_BATCH_MAX_ITEMS)
+    force: bool = Field(False, description="Regenerate every section")
+
+
+class ReportSectionResponse(BaseModel):
+    """Response model for one section of a generated report."""
+    key: str
+    title: str
+    position: int
+    input_hash: str
+    content: str
+    reused: bool
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
 class ChatRequest(BaseModel):
     """Request model for the RAG chat endpoint."""
     query: str
@@ -51,3 +87,59 @@ class ChatResponse(BaseModel):
     """Response model for the RAG chat endpoint."""
     answer: str
     source: str
+
+
+class IngestRequest(BaseModel):
+    """Request model for knowledge base ingestion."""
+    path: str = Field(".", description="Directory relative to KNOWLEDGE_BASE_DIR")
+    prune: bool = Field(False, description="Remove documents whose files were deleted")
+
+
+class SearchResult(BaseModel):
+    """A single full-text search hit."""
+    type: str = Field(..., description="alert or report")
+    id: int
+    title: Optional[str]
+    snippet: Optional[str] = Field(None, description="HTML-escaped matching excerpt with <mark> highlights")
+    score: float
+    impact: Optional[str] = None
+    status: Optional[str] = None
+    created_at: datetime
+
+
+class SearchResponse(BaseModel):
+    """Ranked search results with facet counts over all matches."""
+    query: str
+    results: List[SearchResult]
+    facets: Dict[str, Dict[str, Dict[str, int]]]
+
+
+class AlertStats(BaseModel):
+    """Alert counts by impact level and open/actioned state."""
+    total: int
+    by_impact: Dict[str, int]
+    open: int
+    actioned: int
+
+
+class ReportStats(BaseModel):
+    """Report counts by generation status."""
+    total: int
+    by_status: Dict[str, int]
+
+
+class StatsTrendPoint(BaseModel):
+    """Alerts and reports created in one hour/day bucket."""
+    bucket_start: datetime
+    alerts: int
+    alerts_by_impact: Dict[str, int]
+    reports: int
+
+
+class StatsResponse(BaseModel):
+    """Dashboard statistics served from the aggregate tables."""
+    alerts: AlertStats
+    reports: ReportStats
+    granularity: str
+    trend: List[StatsTrendPoint]
+    generated_at: datetime
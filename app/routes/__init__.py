@@ -1,4 +1,4 @@
 """Routes Module - All API Endpoints"""
-from app.routes import auth, alerts, reports, chat
+from app.routes import auth, alerts, reports, chat, admin, knowledge, search, stats, export
 
-__all__ = ["auth", "alerts", "reports", "chat"]
+__all__ = ["auth", "alerts", "reports", "chat", "admin", "knowledge", "search", "stats", "export"]
@@ -0,0 +1,65 @@
+"""Admin Endpoints (Profiling & Diagnostics)"""
+
+import logging
+from fastapi import APIRouter, Depends, HTTPException
+from app.services.profiling import get_slow_requests, get_slow_request, clear_slow_requests
+from app.services.retention import run_retention
+from app.services.security import require_admin
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/v1/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+
+@router.get("/slow-requests")
+async def list_slow_requests(limit: int = 20, min_ms: float = 0):
+    """
+    List captured slow request profiles, newest first.
+    
+    Query Parameters:
+        limit: Maximum number of profiles to return
+        min_ms: Only return requests at least this slow (milliseconds)
+    
+    Returns:
+        List of profile summaries
+    """
+    return get_slow_requests(limit=limit, min_ms=min_ms)
+
+
+@router.get("/slow-requests/{profile_id}")
+async def get_slow_request_profile(profile_id: str):
+    """
+    Fetch a captured profile with its full span tree.
+    
+    Path Parameters:
+        profile_id: Value of the X-Profile-Id response header
+    
+    Returns:
+        Profile with span tree
+    """
+    profile = get_slow_request(profile_id)
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return profile
+
+
+@router.delete("/slow-requests")
+async def delete_slow_requests():
+    """Clear the slow-request buffer."""
+    clear_slow_requests()
+    logger.info("✓ Slow-request buffer cleared")
+    return {"status": "cleared"}
+
+
+@router.post("/retention/run")
+def run_retention_now():
+    """
+    Run data retention immediately (normally scheduled every RETENTION_INTERVAL_HOURS).
+    
+    Archives alerts/reports matching RETENTION_POLICIES in small batches,
+    then reclaims free space and refreshes planner statistics.
+    
+    Returns:
+        Rows archived per table and compaction results
+    """
+    return run_retention()
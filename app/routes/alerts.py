@@ -2,13 +2,18 @@
 
 import logging
 from typing import List
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from app.models.database import SessionLocal, ComplianceAlert
 from app.models.schemas import ComplianceAlertResponse
+from app.services.http_cache import response_cache, make_cached_body, conditional_response
+from app.services.profiling import span
+from app.services.retention import load_archived
+from app.services.serialization import FastJSONResponse, model_columns, rows_to_dicts
+from app.services.security import get_current_user
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api/v1", tags=["alerts"])
+router = APIRouter(prefix="/api/v1", tags=["alerts"], dependencies=[Depends(get_current_user)])
 
 
 @router.get("/alerts", response_model=List[ComplianceAlertResponse])
@@ -25,9 +30,16 @@ async def get_alerts(skip: int = 0, limit: int = 10):
     """
     db = SessionLocal()
     try:
-        alerts = db.query(ComplianceAlert).offset(skip).limit(limit).all()
-        logger.info(f"✓ Fetched {len(alerts)} alerts")
-        return alerts
+        with span("db", op="list_alerts"):
+            rows = (
+                db.query(*model_columns(ComplianceAlertResponse, ComplianceAlert))
+                .offset(skip)
+                .limit(limit)
+                .all()
+            )
+        logger.info(f"✓ Fetched {len(rows)} alerts")
+        with span("serialization"):
+            return FastJSONResponse(rows_to_dicts(ComplianceAlertResponse, rows))
     except Exception as e:
         logger.error(f"✗ Failed to fetch alerts: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch alerts")
@@ -36,22 +48,41 @@ async def get_alerts(skip: int = 0, limit: int = 10):
 
 
 @router.get("/alerts/{alert_id}", response_model=ComplianceAlertResponse)
-async def get_alert(alert_id: int):
+async def get_alert(alert_id: int, request: Request):
     """
     Fetch a specific compliance alert by ID.
     
+    Alerts are immutable once written, so the serialized body is cached in
+    memory and served with ETag/Last-Modified; conditional requests from
+    clients holding the current version get a 304. Alerts moved out by the
+    retention policy are served from the archive.
+    
     Path Parameters:
         alert_id: ID of the alert
     
     Returns:
         ComplianceAlert object
     """
+    cached = response_cache.get(("alert", alert_id))
+    if cached is not None:
+        return conditional_response(request, cached)
+    
     db = SessionLocal()
     try:
-        alert = db.query(ComplianceAlert).filter(ComplianceAlert.id == alert_id).first()
-        if not alert:
-            raise HTTPException(status_code=404, detail="Alert not found")
-        return alert
+        with span("db", op="fetch_alert"):
+            alert = db.query(ComplianceAlert).filter(ComplianceAlert.id == alert_id).first()
+        if alert:
+            response = ComplianceAlertResponse.model_validate(alert)
+        else:
+            with span("db", op="fetch_archived_alert"):
+                archived = load_archived("alert", alert_id)
+            if archived is None:
+                raise HTTPException(status_code=404, detail="Alert not found")
+            response = ComplianceAlertResponse(**archived)
+        with span("serialization"):
+            cached = make_cached_body(response, last_modified=response.created_at, immutable=True)
+        response_cache.set(("alert", alert_id), cached)
+        return conditional_response(request, cached)
     except HTTPException:
         raise
     except Exception as e:
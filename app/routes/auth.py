@@ -1,28 +1,99 @@
 """Authentication Endpoints"""
 
 import logging
-from datetime import datetime
-from fastapi import APIRouter
-from app.models.schemas import LoginRequest, LoginResponse
+from fastapi import APIRouter, Depends, HTTPException
+from app.config import JWT_EXPIRE_MINUTES
+from app.models.database import SessionLocal, User
+from app.models.schemas import LoginRequest, LoginResponse, UserResponse
+from app.services.security import (
+    create_access_token,
+    get_current_user,
+    hash_password_async,
+    verify_password_async,
+)
+from app.services.ratelimit import get_token_usage, tenant_for
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1", tags=["auth"])
 
 
+@router.post("/register", response_model=UserResponse, status_code=201)
+async def register(request: LoginRequest):
+    """
+    Create a user account.
+
+    Args:
+        request: LoginRequest with email and password
+
+    Returns:
+        The created user
+    """
+    email = request.email.strip().lower()
+    password_hash = await hash_password_async(request.password)
+
+    db = SessionLocal()
+    try:
+        if db.query(User.id).filter(User.email == email).first():
+            raise HTTPException(status_code=409, detail="Email already registered")
+
+        user = User(email=email, password_hash=password_hash)
+        db.add(user)
+        db.commit()
+        logger.info(f"✓ Registered user: {email}")
+        return UserResponse(id=user.id, email=user.email)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"✗ Failed to register user {email}: {e}")
+        db.rollback()
+        raise HTTPException(status_code=500, detail="Failed to register user")
+    finally:
+        db.close()
+
+
 @router.post("/login", response_model=LoginResponse)
 async def login(request: LoginRequest):
     """
-    Dummy login endpoint. Accepts any email/password and returns a mock JWT token.
-    
+    Verify credentials and issue a signed JWT access token.
+
     Args:
         request: LoginRequest with email and password
-    
+
     Returns:
-        LoginResponse with mock token
+        LoginResponse with bearer token and its lifetime
     """
-    # In a real app, validate credentials against database
-    # For now, accept any email/password
-    mock_token = f"mock_jwt_token_{request.email}_{datetime.now().timestamp()}"
-    logger.info(f"✓ Login: {request.email}")
-    return LoginResponse(access_token=mock_token)
+    email = request.email.strip().lower()
+
+    db = SessionLocal()
+    try:
+        user = db.query(User.id, User.email, User.password_hash).filter(User.email == email).first()
+    finally:
+        db.close()
+
+    # Password hashing runs in the thread pool to keep the event loop free.
+    # Unknown emails are still hashed so the 401 takes as long either way.
+    password_ok = await verify_password_async(request.password, user.password_hash if user else None)
+    if not user or not password_ok:
+        logger.info(f"✗ Login failed: {email}")
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid email or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    token = create_access_token(user.id, user.email)
+    logger.info(f"✓ Login: {email}")
+    return LoginResponse(access_token=token, expires_in=JWT_EXPIRE_MINUTES * 60)
+
+
+@router.get("/me", response_model=UserResponse)
+async def me(current_user: UserResponse = Depends(get_current_user)):
+    """Return the user the bearer token belongs to."""
+    return current_user
+
+
+@router.get("/me/usage")
+async def my_usage(current_user: UserResponse = Depends(get_current_user)):
+    """Return today's LLM token usage and remaining budget for the current user."""
+    return get_token_usage(tenant_for(current_user))
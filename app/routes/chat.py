@@ -1,38 +1,61 @@
 """RAG Chat Endpoints (Reliable Chat)"""
 
 import logging
-from fastapi import APIRouter
-from app.models.schemas import ChatRequest, ChatResponse
-from app.config import GEMINI_API_KEY, llm, mock_vector_store
+import os
+from fastapi import APIRouter, Depends
+from starlette.concurrency import run_in_threadpool
+from app.models.schemas import ChatRequest, ChatResponse, UserResponse
+from app.config import GEMINI_API_KEY, get_llm, mock_vector_store
+from app.services.profiling import span
+from app.services.security import get_current_user
+from app.services.llm import invoke_llm
+from app.services.retrieval import is_relevant, search_knowledge
+from app.services.ratelimit import rate_limit, tenant_for
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api/v1", tags=["chat"])
+router = APIRouter(prefix="/api/v1", tags=["chat"], dependencies=[Depends(get_current_user)])
 
 
 @router.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
+async def chat(request: ChatRequest, current_user: UserResponse = Depends(rate_limit("chat"))):
     """
     RAG-based compliance Q&A endpoint.
     
-    Searches mock vector store for relevant context and returns an answer.
+    Searches the ingested knowledge base (falling back to the mock vector
+    store) for relevant context and returns an answer.
     
     Args:
         request: ChatRequest with query string
+        current_user: Authenticated user (rate-limited and charged for LLM tokens)
     
     Returns:
         ChatResponse with answer and source
     """
     query = request.query.lower()
     
-    # Search mock vector store for relevant context
+    # Search the ingested knowledge base first
     context = None
     matched_key = None
-    for key in mock_vector_store:
-        if key in query:
-            context = mock_vector_store[key]
-            matched_key = key
-            break
+    try:
+        # Retrieval and the LLM call block, so both run in the thread pool.
+        # Fused scores are always positive, so keep only hits with real evidence.
+        hits = [hit for hit in await run_in_threadpool(search_knowledge, request.query, k=3) if is_relevant(hit)]
+    except Exception as e:
+        logger.warning(f"⚠ CHAT: Knowledge base search failed: {e}")
+        hits = []
+    if hits:
+        context = "\n\n---\n\n".join(hit["text"] for hit in hits)
+        matched_key = ", ".join(sorted({os.path.basename(hit["source"]) for hit in hits}))
+    
+    # Fall back to the built-in mock vector store
+    if not context:
+        with span("retrieval", index="mock"):
+            for key in mock_vector_store:
+                if key in query:
+                    context = mock_vector_store[key]
+                    matched_key = key
+                    break
     
     # If no context found, provide a generic response
     if not context:
@@ -44,7 +67,7 @@ async def chat(request: ChatRequest):
     
     logger.info(f"🤖 CHAT: Query received: '{request.query}' (Matched: {matched_key})")
     
-    if GEMINI_API_KEY and llm:
+    if GEMINI_API_KEY and get_llm():
         # Real API call with RAG
         try:
             rag_prompt = f"""You are a compliance expert assistant. 
@@ -56,7 +79,7 @@ User Question: {request.query}
 
 Answer based ONLY on the context above. If the context doesn't answer the question, say so."""
             
-            response = llm.invoke(rag_prompt)
+            response = await run_in_threadpool(invoke_llm, rag_prompt, tenant=tenant_for(current_user), call="chat")
             answer = response.content
             source = f"Compliance DB (Key: {matched_key})"
             logger.info("✓ CHAT: Real API response generated")
@@ -71,4 +94,5 @@ Answer based ONLY on the context above. If the context doesn't answer the questi
         answer = f"This is a mock answer. Based on your query, I found this context: {context}"
         source = f"Mock: {matched_key.upper()}"
     
-    return ChatResponse(answer=answer, source=source)
+    with span("serialization"):
+        return ChatResponse(answer=answer, source=source)
@@ -0,0 +1,59 @@
+"""Bulk Export Endpoints (Alerts & Reports for Auditors)"""
+
+import logging
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from app.services.export import (
+    MEDIA_TYPES,
+    COLUMNAR_FORMATS,
+    columnar_available,
+    export_stream,
+)
+from app.services.security import get_current_user
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/v1", tags=["export"], dependencies=[Depends(get_current_user)])
+
+
+@router.get("/export/{resource}")
+def export(
+    resource: str,
+    format: str = Query("ndjson", pattern="^(ndjson|csv|parquet|arrow)$", description="Output format"),
+    since: Optional[datetime] = Query(None, description="Only rows created at or after this time (UTC)"),
+    until: Optional[datetime] = Query(None, description="Only rows created before this time (UTC)"),
+    impact: Optional[str] = Query(None, description="Only alerts with this impact level"),
+    status: Optional[str] = Query(None, description="Only reports with this status"),
+):
+    """
+    Stream the full history of alerts or reports.
+    
+    Rows are read with a server-side cursor and written batch by batch, so
+    memory use does not grow with the size of the export.
+    
+    Path Parameters:
+        resource: alerts or reports
+    
+    Query Parameters:
+        format: ndjson, csv, parquet or arrow (the last two require pyarrow)
+        since / until: created_at range
+        impact: Filter alerts by impact level
+        status: Filter reports by status
+    
+    Returns:
+        Streaming file download
+    """
+    if resource not in ("alerts", "reports"):
+        raise HTTPException(status_code=404, detail="Unknown export resource")
+    if format in COLUMNAR_FORMATS and not columnar_available():
+        raise HTTPException(status_code=501, detail=f"{format} export requires pyarrow")
+    
+    logger.info(f"✓ Exporting {resource} as {format}")
+    filename = f"{resource}-{datetime.utcnow():%Y%m%dT%H%M%SZ}.{format}"
+    return StreamingResponse(
+        export_stream(resource, format, since=since, until=until, impact=impact, status=status),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
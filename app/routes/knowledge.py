@@ -0,0 +1,84 @@
+"""Knowledge Base Endpoints (RAG Corpus Ingestion)"""
+
+import logging
+import os
+import threading
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from app.config import KNOWLEDGE_BASE_DIR
+from app.models.database import SessionLocal, KnowledgeDocument, KnowledgeChunk
+from app.models.schemas import IngestRequest
+from app.services.ingestion import ingest_directory
+from app.services.security import require_admin
+
+logger = logging.getLogger(__name__)
+
+# Ingestion is CPU-heavy (process pool), so the whole router is admin-only
+router = APIRouter(prefix="/api/v1/knowledge", tags=["knowledge"], dependencies=[Depends(require_admin)])
+
+# Only one ingestion runs at a time per worker
+_ingest_lock = threading.Lock()
+_last_run = {"stats": None, "error": None}
+
+
+@router.post("/ingest", status_code=202)
+async def ingest(request: IngestRequest, background_tasks: BackgroundTasks):
+    """
+    Start incremental ingestion of a directory under KNOWLEDGE_BASE_DIR.
+    
+    Unchanged documents are skipped; changed documents only re-embed
+    changed chunks. Runs in the background.
+    
+    Args:
+        request: IngestRequest with directory path and prune flag
+    
+    Returns:
+        Confirmation with the resolved directory
+    """
+    root = os.path.realpath(KNOWLEDGE_BASE_DIR)
+    directory = os.path.realpath(os.path.join(root, request.path))
+    if directory != root and not directory.startswith(root + os.sep):
+        raise HTTPException(status_code=400, detail="Path must be inside the knowledge base directory")
+    if not os.path.isdir(directory):
+        raise HTTPException(status_code=404, detail="Directory not found")
+    if _ingest_lock.locked():
+        raise HTTPException(status_code=409, detail="Ingestion already running")
+    
+    background_tasks.add_task(_run_ingestion, directory, request.prune)
+    logger.info(f"✓ Knowledge ingestion queued for {directory}")
+    return {"status": "started", "directory": directory}
+
+
+def _run_ingestion(directory: str, prune: bool):
+    """Background task running ingest_directory() under the ingestion lock."""
+    if not _ingest_lock.acquire(blocking=False):
+        logger.warning("⚠ INGEST: Another ingestion is running, skipping")
+        return
+    try:
+        _last_run["stats"] = ingest_directory(directory, prune=prune)
+        _last_run["error"] = None
+    except Exception as e:
+        logger.error(f"✗ INGEST: Ingestion failed: {e}")
+        _last_run["error"] = str(e)
+    finally:
+        _ingest_lock.release()
+
+
+@router.get("/status")
+async def ingestion_status():
+    """
+    Knowledge base size and the outcome of the last ingestion run.
+    
+    Returns:
+        Document/chunk counts, running flag and last run stats
+    """
+    db = SessionLocal()
+    try:
+        return {
+            "running": _ingest_lock.locked(),
+            "documents": db.query(KnowledgeDocument).count(),
+            "chunks": db.query(KnowledgeChunk).count(),
+            "last_run": _last_run["stats"],
+            "last_error": _last_run["error"],
+        }
+    finally:
+        db.close()
@@ -1,44 +1,141 @@
 """Report Generation Endpoints (Executor)"""
 
 import logging
-from typing import List
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from app.models.database import SessionLocal, ComplianceAlert, GeneratedReport
-from app.models.schemas import GeneratedReportResponse
-from app.config import GEMINI_API_KEY, llm
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request
+from app.models.database import SessionLocal, ComplianceAlert, GeneratedReport, ReportSection
+from app.models.schemas import GeneratedReportResponse, ReportBatchRequest, ReportSectionResponse, UserResponse
+from app.config import COMPANY_ID, GEMINI_API_KEY, get_llm
 from app.agents import (
     get_compliance_analyst_agent,
     get_company_data_fetcher_agent,
     get_report_writer_agent,
-    generate_mock_executor_report,
+    generate_mock_section,
+    assemble_report,
 )
+from app.services.company_data import get_company_data, prefetch_company_data
+from app.services.http_cache import response_cache, make_cached_body, conditional_response
+from app.services.profiling import span
+from app.services.report_sections import (
+    SECTION_TITLES,
+    build_sections,
+    save_sections,
+    section_inputs,
+    section_task_description,
+)
+from app.services.retention import load_archived
+from app.services.serialization import FastJSONResponse, model_columns, rows_to_dicts
+from app.services.security import get_current_user
+from app.services.llm import llm_breaker, record_crew_usage
+from app.services.ratelimit import check_rate_limit, llm_slot, rate_limit, tenant_for
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api/v1", tags=["reports"])
+router = APIRouter(prefix="/api/v1", tags=["reports"], dependencies=[Depends(get_current_user)])
 
 
 @router.post("/reports/generate")
-async def generate_report(alert_id: int, background_tasks: BackgroundTasks):
+async def generate_report(
+    alert_id: int,
+    background_tasks: BackgroundTasks,
+    force: bool = False,
+    company_id: Optional[str] = None,
+    current_user: UserResponse = Depends(rate_limit("reports_generate")),
+):
     """
     Trigger the Executor to generate a compliance report from an alert.
     
     The report generation happens in the background via crew.ai agents.
+    Sections whose inputs (alert summary, impact, analysis, company data)
+    match an earlier report are reused; only changed sections are generated.
     
     Query Parameters:
         alert_id: ID of the ComplianceAlert to analyze
+        force: Regenerate every section
+        company_id: Company whose data the report uses (default: COMPANY_ID)
     
     Returns:
         Confirmation message with report ID
     """
     db = SessionLocal()
     try:
-        # Fetch the alert
-        alert = db.query(ComplianceAlert).filter(ComplianceAlert.id == alert_id).first()
-        if not alert:
-            raise HTTPException(status_code=404, detail="Alert not found")
+        report_id = _start_report_generation(
+            db, background_tasks, alert_id, company_id or COMPANY_ID, tenant_for(current_user), force
+        )
+        return {"report_id": report_id, "status": "in_progress"}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"✗ Failed to initiate report generation: {e}")
+        raise HTTPException(status_code=500, detail="Failed to initiate report generation")
+    finally:
+        db.close()
+
+
+@router.post("/reports/generate/batch")
+def generate_reports_batch(
+    request: ReportBatchRequest,
+    background_tasks: BackgroundTasks,
+    current_user: UserResponse = Depends(get_current_user),
+):
+    """
+    Trigger report generation for several alerts at once.
+    
+    Each report costs one token from the reports_generate_batch bucket (sized
+    for one maximum-size batch), so a batch is only admitted if it fits. Company data for every company in
+    the batch is prefetched with a single provider call before the reports
+    are queued. (Sync handler: the provider and database I/O run in the
+    thread pool.)
+    
+    Args:
+        request: ReportBatchRequest with (alert_id, company_id) items
+    
+    Returns:
+        Report IDs in request order
+    """
+    check_rate_limit(current_user, "reports_generate_batch", cost=len(request.items))
+    
+    items = [(item.alert_id, item.company_id or COMPANY_ID) for item in request.items]
+    prefetch_company_data(company_id for _, company_id in items)
+    
+    db = SessionLocal()
+    try:
+        with span("db", op="fetch_alerts"):
+            found = {
+                alert_id
+                for (alert_id,) in db.query(ComplianceAlert.id).filter(
+                    ComplianceAlert.id.in_([alert_id for alert_id, _ in items])
+                )
+            }
+        missing = sorted({alert_id for alert_id, _ in items} - found)
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Alerts not found: {missing}")
         
-        # Create report record
+        tenant = tenant_for(current_user)
+        report_ids = [
+            _start_report_generation(db, background_tasks, alert_id, company_id, tenant, request.force)
+            for alert_id, company_id in items
+        ]
+        return {"report_ids": report_ids, "status": "in_progress"}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"✗ Failed to initiate batch report generation: {e}")
+        raise HTTPException(status_code=500, detail="Failed to initiate report generation")
+    finally:
+        db.close()
+
+
+def _start_report_generation(db, background_tasks: BackgroundTasks, alert_id: int, company_id: str, tenant: str, force: bool) -> int:
+    """Creates the in-progress report record and queues its generation."""
+    # Fetch the alert
+    with span("db", op="fetch_alert"):
+        alert = db.query(ComplianceAlert).filter(ComplianceAlert.id == alert_id).first()
+    if not alert:
+        raise HTTPException(status_code=404, detail="Alert not found")
+    
+    # Create report record
+    with span("db", op="create_report"):
         report = GeneratedReport(
             alert_id=alert_id,
             status="in_progress",
@@ -48,38 +145,92 @@ async def generate_report(alert_id: int, background_tasks: BackgroundTasks):
         db.add(report)
         db.commit()
         report_id = report.id
-        
-        # Add background task to generate report
-        background_tasks.add_task(
-            _execute_report_generation,
-            report_id=report_id,
-            alert_id=alert_id,
-        )
-        
-        logger.info(f"✓ Report generation started for alert {alert_id} (Report ID: {report_id})")
-        return {"report_id": report_id, "status": "in_progress"}
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"✗ Failed to initiate report generation: {e}")
-        raise HTTPException(status_code=500, detail="Failed to initiate report generation")
-    finally:
-        db.close()
+    
+    # Add background task to generate report
+    background_tasks.add_task(
+        _execute_report_generation,
+        report_id=report_id,
+        alert_id=alert_id,
+        tenant=tenant,
+        force=force,
+        company_id=company_id,
+    )
+    
+    logger.info(f"✓ Report generation started for alert {alert_id} (Report ID: {report_id})")
+    return report_id
 
 
-def _execute_report_generation(report_id: int, alert_id: int):
+def _execute_report_generation(
+    report_id: int, alert_id: int, tenant: str = "system", force: bool = False, company_id: str = COMPANY_ID
+):
     """
     Background task that executes the Executor crew to generate a report.
     
     Args:
         report_id: ID of the GeneratedReport to update
         alert_id: ID of the ComplianceAlert to analyze
+        tenant: Budget key the crew's LLM tokens are charged to
+        force: Regenerate every section instead of reusing unchanged ones
+        company_id: Company whose data the report uses
+    """
+    with span("report_generation", report_id=report_id, alert_id=alert_id):
+        _run_report_generation(report_id, alert_id, tenant, force, company_id)
+
+
+def _generate_llm_sections(alert, company_data: dict, keys: List[str], tenant: str, fetch_company_data: bool) -> dict:
     """
+    Runs the crew with one writer task per section that needs (re)generating.
+    
+    The company data fetcher only runs when no provider had structured data.
+    """
+    from crew import Task, Crew
+    
+    task_analyze = Task(
+        description=f"""Analyze this compliance alert:
+        {alert.summary}
+        
+        Provide a structured analysis including impact and required actions.""",
+        agent=get_compliance_analyst_agent(),
+        expected_output="Structured compliance analysis",
+    )
+    
+    agents = [get_compliance_analyst_agent(), get_report_writer_agent()]
+    tasks = [task_analyze]
+    if fetch_company_data:
+        agents.insert(1, get_company_data_fetcher_agent())
+        tasks.append(Task(
+            description=f"Fetch company data for compliance reporting (company id: {company_data.get('company_id')})",
+            agent=get_company_data_fetcher_agent(),
+            expected_output="JSON company metadata",
+        ))
+    
+    section_tasks = [
+        Task(
+            description=section_task_description(key, alert, company_data),
+            agent=get_report_writer_agent(),
+            expected_output=f"Markdown '{SECTION_TITLES[key]}' section",
+        )
+        for key in keys
+    ]
+    
+    crew = Crew(agents=agents, tasks=[*tasks, *section_tasks], verbose=True)
+    
+    # Fails fast with CircuitOpenError during an LLM outage
+    with span("llm", call="crew_kickoff", sections=len(keys)), llm_breaker.guard(), llm_slot():
+        result = crew.kickoff()
+    record_crew_usage(tenant, result)
+    outputs = result.tasks_output[-len(keys):]
+    return {key: str(getattr(output, "raw", output)) for key, output in zip(keys, outputs)}
+
+
+def _run_report_generation(report_id: int, alert_id: int, tenant: str, force: bool = False, company_id: str = COMPANY_ID):
+    """Generates and saves the report (wrapped in a profiling span above)."""
     db = SessionLocal()
     try:
         # Fetch alert and report
-        alert = db.query(ComplianceAlert).filter(ComplianceAlert.id == alert_id).first()
-        report = db.query(GeneratedReport).filter(GeneratedReport.id == report_id).first()
+        with span("db", op="fetch_alert_and_report"):
+            alert = db.query(ComplianceAlert).filter(ComplianceAlert.id == alert_id).first()
+            report = db.query(GeneratedReport).filter(GeneratedReport.id == report_id).first()
         
         if not alert or not report:
             logger.error(f"✗ Alert or Report not found: alert_id={alert_id}, report_id={report_id}")
@@ -87,89 +238,56 @@ def _execute_report_generation(report_id: int, alert_id: int):
         
         logger.info(f"📋 EXECUTOR: Starting report generation for Alert #{alert_id}")
         
-        if GEMINI_API_KEY and llm:
-            # Real crew.ai execution
+        # Structured company data from the configured provider (cached); without
+        # it the crew's data fetcher agent has to look the company up, and the
+        # company id is the only company input (so sections hash per company)
+        with span("company_data", company_id=company_id):
+            company_data = get_company_data(company_id)
+        structured = company_data is not None
+        company_data = company_data if structured else {"company_id": company_id}
+        inputs = section_inputs(alert, company_data)
+        
+        def mock_sections(keys):
+            return {key: generate_mock_section(key, alert, company_data) for key in keys}
+        
+        mock = True
+        if GEMINI_API_KEY and get_llm():
+            # Real crew.ai execution, only for sections whose inputs changed
             logger.info("✓ EXECUTOR: Using real Gemini API")
             
             try:
-                from crew import Task, Crew
-                
-                # Mock company data (in real implementation, this would come from a real data source)
-                company_data = {
-                    "company_name": "Startup Inc.",
-                    "data_locations": ["aws-uae-north-1", "gcp-dammam"],
-                    "user_count": 45000,
-                }
-                
-                # Define crew.ai tasks
-                task_analyze = Task(
-                    description=f"""Analyze this compliance alert:
-                    {alert.summary}
-                    
-                    Provide a structured analysis including impact and required actions.""",
-                    agent=get_compliance_analyst_agent(),
-                    expected_output="Structured compliance analysis",
-                )
-                
-                task_fetch_data = Task(
-                    description="Fetch company data for compliance reporting",
-                    agent=get_company_data_fetcher_agent(),
-                    expected_output="JSON company metadata",
-                )
-                
-                task_write_report = Task(
-                    description=f"""Write a comprehensive compliance report in Markdown based on:
-                    1. Alert: {alert.summary}
-                    2. Company: {company_data['company_name']}
-                    3. Impact level: {alert.impact_json.get('impact', 'Medium')}
-                    
-                    Include executive summary, findings, and recommendations.""",
-                    agent=get_report_writer_agent(),
-                    expected_output="Full Markdown report",
-                )
-                
-                # Create and execute crew
-                crew = Crew(
-                    agents=[
-                        get_compliance_analyst_agent(),
-                        get_company_data_fetcher_agent(),
-                        get_report_writer_agent(),
-                    ],
-                    tasks=[task_analyze, task_fetch_data, task_write_report],
-                    verbose=True,
+                sections = build_sections(
+                    db,
+                    inputs,
+                    "llm",
+                    lambda keys: _generate_llm_sections(alert, company_data, keys, tenant, not structured),
+                    force,
                 )
-                
-                result = crew.kickoff()
-                report_content = str(result)
+                mock = False
                 logger.info("✓ EXECUTOR: Report generation completed with real API")
             
             except Exception as e:
                 logger.warning(f"⚠ EXECUTOR: Real API failed: {e}. Falling back to mock.")
-                company_data = {
-                    "company_name": "Startup Inc.",
-                    "data_locations": ["aws-uae-north-1", "gcp-dammam"],
-                    "user_count": 45000,
-                }
-                report_content = generate_mock_executor_report(alert, company_data)
+                sections = build_sections(db, inputs, "mock", mock_sections, force)
         else:
             # Mock report generation
             logger.info("EXECUTOR: No API key. Generating mock report.")
-            company_data = {
-                "company_name": "Startup Inc.",
-                "data_locations": ["aws-uae-north-1", "gcp-dammam"],
-                "user_count": 45000,
-            }
-            report_content = generate_mock_executor_report(alert, company_data)
+            sections = build_sections(db, inputs, "mock", mock_sections, force)
+        
+        report_content = assemble_report({section["key"]: section["content"] for section in sections}, mock=mock)
         
         # Update report in database
-        report.status = "completed"
-        report.content_markdown = report_content
-        db.commit()
+        with span("db", op="save_report"):
+            save_sections(db, report_id, sections)
+            report.status = "completed"
+            report.content_markdown = report_content
+            db.commit()
         logger.info(f"✓ EXECUTOR: Report saved to DB (ID: {report_id})")
     
     except Exception as e:
         logger.error(f"✗ EXECUTOR: Report generation failed: {e}")
         try:
+            db.rollback()
             report = db.query(GeneratedReport).filter(GeneratedReport.id == report_id).first()
             if report:
                 report.status = "failed"
@@ -194,9 +312,16 @@ async def get_reports(skip: int = 0, limit: int = 10):
     """
     db = SessionLocal()
     try:
-        reports = db.query(GeneratedReport).offset(skip).limit(limit).all()
-        logger.info(f"✓ Fetched {len(reports)} reports")
-        return reports
+        with span("db", op="list_reports"):
+            rows = (
+                db.query(*model_columns(GeneratedReportResponse, GeneratedReport))
+                .offset(skip)
+                .limit(limit)
+                .all()
+            )
+        logger.info(f"✓ Fetched {len(rows)} reports")
+        with span("serialization"):
+            return FastJSONResponse(rows_to_dicts(GeneratedReportResponse, rows))
     except Exception as e:
         logger.error(f"✗ Failed to fetch reports: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch reports")
@@ -205,22 +330,44 @@ async def get_reports(skip: int = 0, limit: int = 10):
 
 
 @router.get("/reports/{report_id}", response_model=GeneratedReportResponse)
-async def get_report(report_id: int):
+async def get_report(report_id: int, request: Request):
     """
     Fetch a specific generated report by ID.
     
+    Every response carries an ETag and conditional requests get a 304.
+    Completed reports are immutable: their serialized body is cached in
+    memory and may be reused by clients for RESPONSE_CACHE_MAX_AGE seconds.
+    Reports still being generated must be revalidated. Reports moved out
+    by the retention policy are served from the archive.
+    
     Path Parameters:
         report_id: ID of the report
     
     Returns:
         GeneratedReport object
     """
+    cached = response_cache.get(("report", report_id))
+    if cached is not None:
+        return conditional_response(request, cached)
+    
     db = SessionLocal()
     try:
-        report = db.query(GeneratedReport).filter(GeneratedReport.id == report_id).first()
-        if not report:
-            raise HTTPException(status_code=404, detail="Report not found")
-        return report
+        with span("db", op="fetch_report"):
+            report = db.query(GeneratedReport).filter(GeneratedReport.id == report_id).first()
+        if report:
+            response = GeneratedReportResponse.model_validate(report)
+        else:
+            with span("db", op="fetch_archived_report"):
+                archived = load_archived("report", report_id)
+            if archived is None:
+                raise HTTPException(status_code=404, detail="Report not found")
+            response = GeneratedReportResponse(**archived)
+        completed = response.status == "completed"
+        with span("serialization"):
+            cached = make_cached_body(response, immutable=completed)
+        if completed:
+            response_cache.set(("report", report_id), cached)
+        return conditional_response(request, cached)
     except HTTPException:
         raise
     except Exception as e:
@@ -228,3 +375,36 @@ async def get_report(report_id: int):
         raise HTTPException(status_code=500, detail="Failed to fetch report")
     finally:
         db.close()
+
+
+@router.get("/reports/{report_id}/sections", response_model=List[ReportSectionResponse])
+async def get_report_sections(report_id: int):
+    """
+    Fetch the addressable sections of a generated report.
+    
+    Path Parameters:
+        report_id: ID of the report
+    
+    Returns:
+        Sections in document order, with their input hashes and whether
+        each was reused from an earlier report
+    """
+    db = SessionLocal()
+    try:
+        with span("db", op="fetch_report_sections"):
+            sections = (
+                db.query(ReportSection)
+                .filter(ReportSection.report_id == report_id)
+                .order_by(ReportSection.position)
+                .all()
+            )
+        if not sections:
+            raise HTTPException(status_code=404, detail="Report sections not found")
+        return sections
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"✗ Failed to fetch sections of report {report_id}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch report sections")
+    finally:
+        db.close()
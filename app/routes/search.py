@@ -0,0 +1,69 @@
+"""Full-Text Search Endpoints (Alerts & Reports)"""
+
+import logging
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from app.models.database import engine
+from app.models.schemas import SearchResponse
+from app.services.profiling import span
+from app.services.search import (
+    search_alerts,
+    search_reports,
+    alert_facets,
+    report_facets,
+    to_fts5_query,
+    is_postgres,
+)
+from app.services.security import get_current_user
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/v1", tags=["search"], dependencies=[Depends(get_current_user)])
+
+
+@router.get("/search", response_model=SearchResponse)
+def search(
+    q: str = Query(..., min_length=1, description="Search terms (all must match)"),
+    type: str = Query("all", pattern="^(all|alerts|reports)$", description="Restrict to alerts or reports"),
+    impact: Optional[str] = Query(None, description="Filter alerts by impact level (e.g. High)"),
+    status: Optional[str] = Query(None, description="Filter reports by status (e.g. completed)"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+):
+    """
+    Full-text search over alert summaries/analysis and report content.
+    
+    Query Parameters:
+        q: Search terms
+        type: all, alerts or reports
+        impact: Only alerts with this impact level
+        status: Only reports with this status
+        skip: Number of results to skip (for pagination)
+        limit: Maximum number of results to return
+    
+    Returns:
+        Ranked results with highlighted snippets, plus impact/status facet
+        counts over all matches (before the impact/status filters)
+    """
+    if not is_postgres() and to_fts5_query(q) is None:
+        raise HTTPException(status_code=400, detail="Query must contain at least one word")
+    
+    window = skip + limit
+    results = []
+    facets = {}
+    try:
+        with engine.connect() as conn:
+            with span("db", op="search"):
+                if type in ("all", "alerts"):
+                    results.extend(search_alerts(conn, q, impact, window))
+                    facets["alerts"] = alert_facets(conn, q)
+                if type in ("all", "reports"):
+                    results.extend(search_reports(conn, q, status, window))
+                    facets["reports"] = report_facets(conn, q)
+    except Exception as e:
+        logger.error(f"✗ Search failed for '{q}': {e}")
+        raise HTTPException(status_code=500, detail="Search failed")
+    
+    results.sort(key=lambda result: result["score"], reverse=True)
+    logger.info(f"✓ Search '{q}': {len(results)} hits")
+    return {"query": q, "results": results[skip:window], "facets": facets}
@@ -0,0 +1,37 @@
+"""Dashboard Statistics Endpoints"""
+
+import logging
+from fastapi import APIRouter, Depends, HTTPException, Query
+from app.models.schemas import StatsResponse
+from app.services.profiling import span
+from app.services.security import get_current_user
+from app.services.stats import get_stats
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/v1", tags=["stats"], dependencies=[Depends(get_current_user)])
+
+
+@router.get("/stats", response_model=StatsResponse)
+def stats(
+    granularity: str = Query("day", pattern="^(hour|day)$", description="Trend bucket size"),
+    days: int = Query(30, ge=1, le=365, description="Days of trend to return"),
+):
+    """
+    Alert and report statistics for the dashboard.
+    
+    Query Parameters:
+        granularity: hour or day trend buckets
+        days: How far back the trend goes
+    
+    Returns:
+        Alert counts by impact and open/actioned state, report counts by
+        status, and alerts/reports created per bucket. Read from the
+        incrementally maintained aggregate tables and cached for a few seconds.
+    """
+    try:
+        with span("db", op="stats"):
+            return get_stats(granularity=granularity, days=days)
+    except Exception as e:
+        logger.error(f"✗ Error fetching stats: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch stats")
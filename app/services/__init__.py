@@ -4,9 +4,18 @@ from app.services.watchtower import (
     stop_watchtower_scheduler,
     generate_mock_watchtower_analysis,
 )
+from app.services.profiling import ProfilingMiddleware, span
+from app.services.security import get_current_user, require_admin
+from app.services.stats import init_stats, get_stats
 
 __all__ = [
     "start_watchtower_scheduler",
     "stop_watchtower_scheduler",
     "generate_mock_watchtower_analysis",
+    "ProfilingMiddleware",
+    "span",
+    "get_current_user",
+    "require_admin",
+    "init_stats",
+    "get_stats",
 ]
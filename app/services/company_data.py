@@ -0,0 +1,217 @@
+"""
+Company Data Service: Pluggable Providers for Executor Report Inputs
+
+Reports need structured company metadata (name, user count, data
+locations). Providers return it as plain dicts keyed by company id:
+
+    StaticCompanyDataProvider   DEFAULT_COMPANY_DATA for every company (default)
+    JSONCompanyDataProvider     {"<company_id>": {...}, ...} file, reloaded when it changes
+    SQLiteCompanyDataProvider   companies(company_id TEXT PRIMARY KEY, data TEXT JSON) table
+
+Real inventory sources plug in by subclassing CompanyDataProvider. The
+shared provider is wrapped in CachedCompanyDataProvider (TTL cache with
+batch prefetch), so a batch of reports costs one backend lookup per company.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, Optional
+
+from app.config import (
+    COMPANY_DATA_BACKEND,
+    COMPANY_DATA_PATH,
+    COMPANY_DATA_CACHE_TTL,
+    DEFAULT_COMPANY_DATA,
+)
+from app.services.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class CompanyDataProvider:
+    """Interface for company metadata backends."""
+
+    def get(self, company_id: str) -> Optional[dict]:
+        """Returns the company's record, or None if unknown."""
+        raise NotImplementedError
+
+    def get_many(self, company_ids: Iterable[str]) -> Dict[str, dict]:
+        """Returns records for the known companies among company_ids (override to batch)."""
+        records = {}
+        for company_id in company_ids:
+            record = self.get(company_id)
+            if record is not None:
+                records[company_id] = record
+        return records
+
+
+class StaticCompanyDataProvider(CompanyDataProvider):
+    """Serves one fixed record for every company (local stand-in)."""
+
+    def __init__(self, record: dict = None):
+        self.record = dict(record if record is not None else DEFAULT_COMPANY_DATA)
+
+    def get(self, company_id: str) -> Optional[dict]:
+        return dict(self.record)
+
+
+class JSONCompanyDataProvider(CompanyDataProvider):
+    """Reads a JSON object of company_id -> record, reloading it when the file changes."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._records = {}
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict:
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            logger.warning(f"⚠ COMPANY DATA: {self.path} not found")
+            return {}
+        with self._lock:
+            if mtime != self._mtime:
+                with open(self.path, encoding="utf-8") as f:
+                    self._records = json.load(f)
+                self._mtime = mtime
+            return self._records
+
+    def get(self, company_id: str) -> Optional[dict]:
+        return self._load().get(company_id)
+
+    def get_many(self, company_ids: Iterable[str]) -> Dict[str, dict]:
+        records = self._load()
+        return {company_id: records[company_id] for company_id in company_ids if company_id in records}
+
+
+class SQLiteCompanyDataProvider(CompanyDataProvider):
+    """Reads records from a `companies` table: company_id TEXT PRIMARY KEY, data TEXT (JSON)."""
+
+    def __init__(self, path: str, table: str = "companies"):
+        self.path = path
+        self.table = table
+
+    def get(self, company_id: str) -> Optional[dict]:
+        return self.get_many([company_id]).get(company_id)
+
+    def get_many(self, company_ids: Iterable[str]) -> Dict[str, dict]:
+        company_ids = list(company_ids)
+        if not company_ids:
+            return {}
+        placeholders = ", ".join("?" for _ in company_ids)
+        connection = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        try:
+            rows = connection.execute(
+                f"SELECT company_id, data FROM {self.table} WHERE company_id IN ({placeholders})", company_ids
+            ).fetchall()
+        finally:
+            connection.close()
+        return {company_id: json.loads(data) for company_id, data in rows}
+
+
+class CachedCompanyDataProvider(CompanyDataProvider):
+    """
+    TTL cache in front of another provider.
+
+    Unknown companies are cached too (as None), so a missing record does not
+    hit the backend on every report.
+    """
+
+    def __init__(self, provider: CompanyDataProvider, ttl: float = COMPANY_DATA_CACHE_TTL, maxsize: int = 1024):
+        self.provider = provider
+        self._cache = LRUCache(maxsize=maxsize, ttl=ttl)
+
+    def get(self, company_id: str) -> Optional[dict]:
+        record = self._cache.get(company_id, _MISSING)
+        if record is _MISSING:
+            record = self.provider.get(company_id)
+            self._cache.set(company_id, record)
+        return dict(record) if record is not None else None
+
+    def get_many(self, company_ids: Iterable[str]) -> Dict[str, dict]:
+        company_ids = set(company_ids)
+        self.prefetch(company_ids)
+        return {
+            company_id: record
+            for company_id, record in ((company_id, self.get(company_id)) for company_id in company_ids)
+            if record is not None
+        }
+
+    def prefetch(self, company_ids: Iterable[str]) -> int:
+        """
+        Loads every uncached company in one backend call.
+
+        Returns:
+            Number of companies fetched from the backend
+        """
+        missing = [company_id for company_id in set(company_ids) if self._cache.get(company_id, _MISSING) is _MISSING]
+        if not missing:
+            return 0
+        records = self.provider.get_many(missing)
+        for company_id in missing:
+            self._cache.set(company_id, records.get(company_id))
+        return len(missing)
+
+    def invalidate(self, company_id: str = None):
+        """Drops one cached company (or all of them)."""
+        if company_id is None:
+            self._cache.clear()
+        else:
+            self._cache.invalidate(company_id)
+
+
+# ============================================================================
+# SHARED PROVIDER
+# ============================================================================
+
+_provider: Optional[CachedCompanyDataProvider] = None
+_provider_lock = threading.Lock()
+
+
+def _create_provider() -> CompanyDataProvider:
+    if COMPANY_DATA_BACKEND == "json":
+        return JSONCompanyDataProvider(COMPANY_DATA_PATH)
+    if COMPANY_DATA_BACKEND == "sqlite":
+        return SQLiteCompanyDataProvider(COMPANY_DATA_PATH)
+    if COMPANY_DATA_BACKEND != "static":
+        logger.warning(f"⚠ COMPANY DATA: Unknown backend '{COMPANY_DATA_BACKEND}'. Using static data.")
+    return StaticCompanyDataProvider()
+
+
+def get_company_data_provider() -> CachedCompanyDataProvider:
+    """Returns the shared, cached provider for COMPANY_DATA_BACKEND."""
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                _provider = CachedCompanyDataProvider(_create_provider())
+                logger.info(f"✓ Company data provider ready ({COMPANY_DATA_BACKEND})")
+    return _provider
+
+
+def get_company_data(company_id: str) -> Optional[dict]:
+    """
+    Structured company data for reports, or None if no backend knows the company.
+
+    Backend errors are logged and treated as "unknown", so report generation
+    can fall back to the LLM fetch step.
+    """
+    try:
+        return get_company_data_provider().get(company_id)
+    except Exception as e:
+        logger.warning(f"⚠ COMPANY DATA: Lookup failed for {company_id}: {e}")
+        return None
+
+
+def prefetch_company_data(company_ids: Iterable[str]) -> None:
+    """Warms the cache for a batch of reports with a single backend call."""
+    try:
+        get_company_data_provider().prefetch(company_ids)
+    except Exception as e:
+        logger.warning(f"⚠ COMPANY DATA: Prefetch failed: {e}")
@@ -0,0 +1,108 @@
+"""Embedding Service: Text Tokenization & Vector Embeddings for the Knowledge Base"""
+
+import hashlib
+import logging
+import math
+import re
+from array import array
+from typing import List
+
+from app.config import EMBEDDING_BACKEND, EMBEDDING_DIM, GEMINI_API_KEY
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[.,/-][a-z0-9]+)*")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercases text and splits it into terms.
+
+    Keeps identifiers like "123", "500,000" or "cbuae/2024-01" together so
+    circular numbers and amounts survive as single terms.
+    """
+    return _TOKEN_RE.findall(text.lower())
+
+
+# ============================================================================
+# LOCAL HASHING EMBEDDINGS
+# ============================================================================
+
+def hashing_embed(text: str, dim: int = EMBEDDING_DIM) -> array:
+    """
+    Embeds text with signed feature hashing over unigrams and bigrams.
+
+    Deterministic and dependency-free, so it can run in worker processes
+    and needs no API key. Vectors are L2-normalized (dot product = cosine).
+
+    Returns:
+        float32 array of length dim
+    """
+    vector = [0.0] * dim
+    terms = tokenize(text)
+    features = terms + [f"{a} {b}" for a, b in zip(terms, terms[1:])]
+    for feature in features:
+        digest = hashlib.blake2b(feature.encode(), digest_size=8).digest()
+        bucket = int.from_bytes(digest[:4], "little") % dim
+        vector[bucket] += 1.0 if digest[4] & 1 else -1.0
+
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return array("f", (v / norm for v in vector))
+
+
+def hashing_embed_batch(texts: List[str]) -> List[bytes]:
+    """Embeds a batch of texts; returns float32 bytes (picklable for process pools)."""
+    return [hashing_embed(text).tobytes() for text in texts]
+
+
+# ============================================================================
+# BACKEND SELECTION
+# ============================================================================
+
+_gemini_embeddings = None
+
+
+def _get_gemini_embeddings():
+    global _gemini_embeddings
+    if _gemini_embeddings is None:
+        from langchain_google_genai import GoogleGenerativeAIEmbeddings
+        _gemini_embeddings = GoogleGenerativeAIEmbeddings(
+            model="models/text-embedding-004",
+            google_api_key=GEMINI_API_KEY,
+        )
+    return _gemini_embeddings
+
+
+def uses_gemini_embeddings() -> bool:
+    """True when embeddings come from the Gemini API rather than local hashing."""
+    return EMBEDDING_BACKEND == "gemini" and bool(GEMINI_API_KEY)
+
+
+def embed_batch(texts: List[str]) -> List[bytes]:
+    """
+    Embeds a batch of texts with the configured backend.
+
+    Returns:
+        float32 bytes per text
+    """
+    if uses_gemini_embeddings():
+        vectors = _get_gemini_embeddings().embed_documents(texts)
+        return [_normalize(vector).tobytes() for vector in vectors]
+    return hashing_embed_batch(texts)
+
+
+def embed_query(text: str) -> array:
+    """
+    Embeds a search query with the configured backend.
+
+    The backend must match the one the corpus was ingested with; switching
+    EMBEDDING_BACKEND requires re-ingesting.
+    """
+    if uses_gemini_embeddings():
+        return _normalize(_get_gemini_embeddings().embed_query(text))
+    return hashing_embed(text)
+
+
+def _normalize(vector) -> array:
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return array("f", (v / norm for v in vector))
@@ -0,0 +1,236 @@
+"""
+Export Service: Streaming Bulk Export of Alerts and Reports
+
+Rows are read with a server-side cursor (Query.yield_per, which also sets
+stream_results) and encoded batch by batch, so memory stays bounded by one
+batch regardless of how many rows are exported. Live rows come first (in id
+order), followed by rows moved to the archive by the retention policy.
+
+Formats:
+    ndjson   One JSON object per line (orjson when installed)
+    csv      Header row, impact_json as a JSON string
+    parquet  One row group per batch (requires pyarrow)
+    arrow    Arrow IPC stream, one record batch per batch (requires pyarrow)
+"""
+
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Iterator, List, Optional
+
+from app.models.database import SessionLocal, ComplianceAlert, GeneratedReport
+from app.services.retention import iter_archived_batches
+from app.services.serialization import dumps
+
+EXPORT_BATCH_SIZE = 1000
+
+TEXT_FORMATS = ("ndjson", "csv")
+COLUMNAR_FORMATS = ("parquet", "arrow")
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+_COLUMNS = {
+    "alerts": (
+        ComplianceAlert,
+        ("id", "source", "summary", "impact_json", "action_required", "created_at"),
+    ),
+    "reports": (
+        GeneratedReport,
+        ("id", "alert_id", "status", "title", "content_markdown", "created_at"),
+    ),
+}
+
+
+def iter_batches(
+    resource: str,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    impact: Optional[str] = None,
+    status: Optional[str] = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+    include_archived: bool = True,
+) -> Iterator[List[dict]]:
+    """
+    Yields lists of row dicts, batch_size rows at a time: live rows in id
+    order, then archived rows in id order.
+
+    Args:
+        resource: "alerts" or "reports"
+        since / until: created_at range (inclusive start, exclusive end)
+        impact: Only alerts with this impact level
+        status: Only reports with this status
+        include_archived: Also yield rows from the retention archive
+    """
+    orm_class, fields = _COLUMNS[resource]
+    db = SessionLocal()
+    try:
+        query = db.query(*(getattr(orm_class, field) for field in fields))
+        if since is not None:
+            query = query.filter(orm_class.created_at >= since)
+        if until is not None:
+            query = query.filter(orm_class.created_at < until)
+        if impact is not None and resource == "alerts":
+            query = query.filter(ComplianceAlert.impact_json["impact"].as_string() == impact)
+        if status is not None and resource == "reports":
+            query = query.filter(GeneratedReport.status == status)
+
+        batch = []
+        for row in query.order_by(orm_class.id).yield_per(batch_size):
+            batch.append(dict(zip(fields, row)))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    finally:
+        db.close()
+
+    if include_archived:
+        yield from iter_archived_batches(resource, since, until, impact, status, batch_size)
+
+
+# ============================================================================
+# ENCODERS
+# ============================================================================
+
+def ndjson_stream(batches: Iterator[List[dict]]) -> Iterator[bytes]:
+    for batch in batches:
+        yield b"".join(dumps(row) + b"\n" for row in batch)
+
+
+def csv_stream(resource: str, batches: Iterator[List[dict]]) -> Iterator[bytes]:
+    _, fields = _COLUMNS[resource]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    for batch in batches:
+        for row in batch:
+            writer.writerow([
+                json.dumps(value, ensure_ascii=False) if isinstance(value, (dict, list))
+                else value.isoformat() if isinstance(value, datetime)
+                else value
+                for value in (row[field] for field in fields)
+            ])
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+class _ChunkSink:
+    """Write-only file object that hands written bytes back to a generator."""
+
+    closed = False
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _arrow_schema(pa, resource: str):
+    if resource == "alerts":
+        return pa.schema([
+            ("id", pa.int64()),
+            ("source", pa.string()),
+            ("summary", pa.string()),
+            ("impact", pa.string()),
+            ("impact_json", pa.string()),
+            ("action_required", pa.bool_()),
+            ("created_at", pa.timestamp("us")),
+        ])
+    return pa.schema([
+        ("id", pa.int64()),
+        ("alert_id", pa.int64()),
+        ("status", pa.string()),
+        ("title", pa.string()),
+        ("content_markdown", pa.string()),
+        ("created_at", pa.timestamp("us")),
+    ])
+
+
+def _arrow_rows(resource: str, batch: List[dict]) -> List[dict]:
+    if resource != "alerts":
+        return batch
+    return [
+        {
+            **row,
+            "impact": (row["impact_json"] or {}).get("impact"),
+            "impact_json": json.dumps(row["impact_json"], ensure_ascii=False),
+        }
+        for row in batch
+    ]
+
+
+def columnar_stream(resource: str, batches: Iterator[List[dict]], format: str) -> Iterator[bytes]:
+    """
+    Encodes batches as Parquet (one row group each) or an Arrow IPC stream.
+
+    Alerts get a top-level "impact" column; impact_json is kept as JSON text.
+
+    Raises:
+        ImportError: When pyarrow is not installed
+    """
+    import pyarrow as pa
+
+    schema = _arrow_schema(pa, resource)
+    sink = _ChunkSink()
+    if format == "parquet":
+        import pyarrow.parquet as pq
+
+        writer = pq.ParquetWriter(sink, schema, compression="zstd")
+        write = lambda record_batch: writer.write_table(pa.Table.from_batches([record_batch]))  # noqa: E731
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+        write = writer.write_batch
+
+    for batch in batches:
+        write(pa.RecordBatch.from_pylist(_arrow_rows(resource, batch), schema=schema))
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+def export_stream(resource: str, format: str, **filters) -> Iterator[bytes]:
+    """Streams resource rows matching filters in the given format."""
+    batches = iter_batches(resource, **filters)
+    if format == "ndjson":
+        return ndjson_stream(batches)
+    if format == "csv":
+        return csv_stream(resource, batches)
+    return columnar_stream(resource, batches, format)
+
+
+def columnar_available() -> bool:
+    """True when pyarrow is installed (Parquet/Arrow export)."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
@@ -0,0 +1,130 @@
+"""
+HTTP Cache Service: ETags, Conditional Requests & Serialized Response Bodies
+
+Alerts and completed reports do not change once written, so GET-by-id
+responses are serialized once and kept in an in-process LRU together with
+their ETag. Repeat requests are answered from memory, and clients that send
+If-None-Match / If-Modified-Since get a bodiless 304.
+
+Cached bodies are invalidated when a report's status or content (or any
+alert field) changes: mapper events drop the entry at flush time and again
+once the session commits, so a reader cannot re-cache the pre-commit row.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import NamedTuple, Optional
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.config import RESPONSE_CACHE_SIZE, RESPONSE_CACHE_MAX_AGE
+from app.models.database import ComplianceAlert, GeneratedReport
+from app.services.cache import LRUCache
+
+# Report fields whose change invalidates a cached body
+_REPORT_FIELDS = ("status", "title", "content_markdown")
+
+
+class CachedBody(NamedTuple):
+    """A serialized JSON response body with its validators."""
+    body: bytes
+    etag: str
+    last_modified: Optional[datetime]
+    immutable: bool
+
+
+response_cache = LRUCache(maxsize=RESPONSE_CACHE_SIZE)
+
+
+def make_cached_body(model: BaseModel, last_modified: Optional[datetime] = None, immutable: bool = False) -> CachedBody:
+    """Serializes a response model once and derives its strong ETag from the bytes."""
+    body = model.model_dump_json().encode()
+    etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+    if last_modified is not None:
+        last_modified = last_modified.replace(microsecond=0, tzinfo=timezone.utc)
+    return CachedBody(body, etag, last_modified, immutable)
+
+
+def _not_modified(request: Request, cached: CachedBody) -> bool:
+    """Evaluates If-None-Match (preferred) or If-Modified-Since against cached."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or cached.etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and cached.last_modified is not None:
+        try:
+            return cached.last_modified <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def conditional_response(request: Request, cached: CachedBody) -> Response:
+    """
+    Builds the response for a cached body: 304 if the client's copy is
+    current, otherwise the JSON body; both carry ETag/Cache-Control.
+
+    Immutable resources may be reused for RESPONSE_CACHE_MAX_AGE seconds;
+    others (e.g. in-progress reports) must be revalidated on every use.
+    """
+    headers = {"ETag": cached.etag}
+    if cached.immutable:
+        headers["Cache-Control"] = f"private, max-age={RESPONSE_CACHE_MAX_AGE}"
+    else:
+        headers["Cache-Control"] = "private, no-cache"
+    if cached.last_modified is not None:
+        headers["Last-Modified"] = format_datetime(cached.last_modified, usegmt=True)
+
+    if _not_modified(request, cached):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
+
+
+# ============================================================================
+# INVALIDATION
+# ============================================================================
+
+def _invalidate_later(target, key: tuple):
+    response_cache.invalidate(key)
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault("invalidated_responses", set()).add(key)
+
+
+# Inserts invalidate too: a body cached for an id that had no live row
+# (e.g. a 404 or an archived row) must not outlive a new row with that id
+@event.listens_for(ComplianceAlert, "after_insert")
+@event.listens_for(ComplianceAlert, "after_update")
+@event.listens_for(ComplianceAlert, "after_delete")
+def _on_alert_change(mapper, connection, target):
+    _invalidate_later(target, ("alert", target.id))
+
+
+@event.listens_for(GeneratedReport, "after_update")
+def _on_report_update(mapper, connection, target):
+    state = inspect(target).attrs
+    if any(state[field].history.has_changes() for field in _REPORT_FIELDS):
+        _invalidate_later(target, ("report", target.id))
+
+
+@event.listens_for(GeneratedReport, "after_insert")
+@event.listens_for(GeneratedReport, "after_delete")
+def _on_report_insert_or_delete(mapper, connection, target):
+    _invalidate_later(target, ("report", target.id))
+
+
+@event.listens_for(Session, "after_commit")
+def _on_commit(session):
+    for key in session.info.pop("invalidated_responses", ()):
+        response_cache.invalidate(key)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _on_rollback(session, previous_transaction):
+    session.info.pop("invalidated_responses", None)
@@ -0,0 +1,338 @@
+"""
+Ingestion Service: Streaming Corpus Ingestion for the RAG Knowledge Base
+
+Pipeline (every stage is a generator, so memory stays bounded by one
+document's chunks plus the in-flight embedding batches):
+
+    iter_source_files -> parse_document -> chunk_text -> embed (process pool) -> upsert
+
+Documents are keyed by path and skipped when their content hash is
+unchanged; chunks are keyed by content hash, so editing a document only
+re-embeds the chunks that actually changed.
+
+CLI:
+    python -m app.services.ingestion ./rulebooks [--batch-size 64] [--workers 4] [--prune]
+"""
+
+import argparse
+import hashlib
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from html.parser import HTMLParser
+from typing import Iterator, List
+
+from app.config import CHUNK_SIZE, CHUNK_OVERLAP
+from app.models.database import SessionLocal, KnowledgeDocument, KnowledgeChunk, init_db
+from app.services.embeddings import embed_batch, hashing_embed_batch, uses_gemini_embeddings
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXTENSIONS = {".pdf", ".html", ".htm", ".md", ".markdown", ".txt"}
+
+
+# ============================================================================
+# PARSING
+# ============================================================================
+
+def iter_source_files(directory: str) -> Iterator[str]:
+    """Yields supported files under directory, in a stable order."""
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in sorted(files):
+            if os.path.splitext(name)[1].lower() in SUPPORTED_EXTENSIONS:
+                yield os.path.join(root, name)
+
+
+class _HTMLTextExtractor(HTMLParser):
+    """Collects visible text from HTML, skipping scripts and styles."""
+
+    _SKIP = {"script", "style", "noscript", "head"}
+    _BLOCK = {"p", "div", "br", "li", "tr", "h1", "h2", "h3", "h4", "h5", "h6", "section", "article"}
+
+    def __init__(self):
+        super().__init__()
+        self.parts = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self._SKIP:
+            self._skip_depth += 1
+        elif tag in self._BLOCK:
+            self.parts.append("\n\n")
+
+    def handle_endtag(self, tag):
+        if tag in self._SKIP and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.parts.append(data)
+
+
+def parse_document(path: str, raw: bytes) -> str:
+    """
+    Extracts plain text from a PDF, HTML or Markdown/text file.
+
+    Raises:
+        ImportError: For PDFs when pypdf is not installed
+    """
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension == ".pdf":
+        import io
+        from pypdf import PdfReader
+
+        reader = PdfReader(io.BytesIO(raw))
+        return "\n\n".join(page.extract_text() or "" for page in reader.pages)
+
+    text = raw.decode("utf-8", errors="replace")
+    if extension in (".html", ".htm"):
+        extractor = _HTMLTextExtractor()
+        extractor.feed(text)
+        return "".join(extractor.parts)
+    return text
+
+
+def _paragraphs(text: str, size: int) -> Iterator[str]:
+    """Yields whitespace-normalized paragraphs, splitting any longer than size."""
+    for paragraph in text.replace("\r\n", "\n").split("\n\n"):
+        paragraph = " ".join(paragraph.split())
+        while len(paragraph) > size:
+            cut = paragraph.rfind(" ", 0, size)
+            cut = cut if cut > 0 else size
+            yield paragraph[:cut]
+            paragraph = paragraph[cut:].lstrip()
+        if paragraph:
+            yield paragraph
+
+
+def chunk_text(text: str, size: int = CHUNK_SIZE, overlap: int = CHUNK_OVERLAP) -> Iterator[str]:
+    """
+    Splits text into ~size-character chunks on paragraph boundaries.
+
+    Each chunk starts with the last `overlap` characters of the previous one
+    so that sentences spanning a boundary are retrievable from either side.
+    """
+    current = ""
+    for paragraph in _paragraphs(text, size):
+        if current and len(current) + len(paragraph) + 2 > size:
+            yield current
+            tail = current[-overlap:] if overlap else ""
+            current = tail[tail.find(" ") + 1:] if " " in tail else tail  # start on a word boundary
+        current = f"{current}\n\n{paragraph}" if current else paragraph
+    if current:
+        yield current
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _batched(items: Iterator, size: int) -> Iterator[List]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# ============================================================================
+# INGESTION
+# ============================================================================
+
+def ingest_directory(directory: str, batch_size: int = 64, workers: int = None, prune: bool = False) -> dict:
+    """
+    Incrementally ingests every supported file under directory.
+
+    Args:
+        directory: Root directory of the corpus
+        batch_size: Chunks per embedding batch
+        workers: Embedding worker processes (default: CPU count)
+        prune: Remove documents whose files no longer exist under directory
+
+    Returns:
+        Ingestion statistics
+    """
+    init_db()
+    directory = os.path.abspath(directory)
+    stats = {
+        "files_seen": 0,
+        "documents_unchanged": 0,
+        "documents_ingested": 0,
+        "documents_failed": 0,
+        "documents_pruned": 0,
+        "chunks_embedded": 0,
+        "chunks_reused": 0,
+        "chunks_removed": 0,
+    }
+    started = datetime.now()
+
+    # Gemini embeddings are network-bound and run in-process; local hashing is CPU-bound
+    pool = None
+    max_in_flight = 1
+    if not uses_gemini_embeddings():
+        workers = workers or os.cpu_count() or 1
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        max_in_flight = 2 * workers
+
+    db = SessionLocal()
+    seen_paths = set()
+    try:
+        for path in iter_source_files(directory):
+            stats["files_seen"] += 1
+            seen_paths.add(path)
+            try:
+                _ingest_file(db, path, pool, max_in_flight, batch_size, stats)
+            except Exception as e:
+                db.rollback()
+                stats["documents_failed"] += 1
+                logger.error(f"✗ INGEST: Failed to ingest {path}: {e}")
+
+        if prune:
+            prefix = directory.rstrip(os.sep) + os.sep
+            for document in db.query(KnowledgeDocument).filter(KnowledgeDocument.path.startswith(prefix)).all():
+                if document.path not in seen_paths:
+                    stats["chunks_removed"] += (
+                        db.query(KnowledgeChunk)
+                        .filter(KnowledgeChunk.document_id == document.id)
+                        .delete(synchronize_session=False)
+                    )
+                    db.delete(document)
+                    stats["documents_pruned"] += 1
+            db.commit()
+    finally:
+        db.close()
+        if pool is not None:
+            pool.shutdown()
+
+    stats["duration_seconds"] = round((datetime.now() - started).total_seconds(), 2)
+    logger.info(f"✓ INGEST: Completed {directory}: {stats}")
+
+    from app.services.retrieval import reload_knowledge_index
+    reload_knowledge_index()
+    return stats
+
+
+def _ingest_file(db, path: str, pool, max_in_flight: int, batch_size: int, stats: dict):
+    """
+    Ingests a single file if its content changed since the last run.
+
+    New chunks are committed batch by batch so the session never holds a
+    whole document; the document hash is only updated once every chunk is
+    stored, so an interrupted run is resumed (reusing stored chunks) next time.
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    document_hash = _sha256(raw)
+
+    document = db.query(KnowledgeDocument).filter(KnowledgeDocument.path == path).first()
+    if document and document.content_hash == document_hash:
+        stats["documents_unchanged"] += 1
+        return
+
+    text = parse_document(path, raw)
+    del raw
+
+    if document is None:
+        document = KnowledgeDocument(path=path, chunk_count=0)
+        db.add(document)
+        db.commit()
+    document_id = document.id
+
+    # Chunks already stored for this document, reusable by content hash. A
+    # document can repeat a chunk, so each hash maps to all of its row ids
+    existing = {}
+    for chunk_hash, chunk_id in (
+        db.query(KnowledgeChunk.content_hash, KnowledgeChunk.id)
+        .filter(KnowledgeChunk.document_id == document_id)
+        .order_by(KnowledgeChunk.id)
+    ):
+        existing.setdefault(chunk_hash, []).append(chunk_id)
+    reused = []  # {"id", "chunk_index"} mappings
+    chunk_count = 0
+
+    def pending_chunks():
+        nonlocal chunk_count
+        for position, chunk in enumerate(chunk_text(text)):
+            chunk_count = position + 1
+            chunk_hash = _sha256(chunk.encode())
+            if existing.get(chunk_hash):
+                reused.append({"id": existing[chunk_hash].pop(0), "chunk_index": position})
+                continue
+            yield position, chunk_hash, chunk
+
+    # Embed new chunks in batches, with a bounded number of batches in flight
+    in_flight = []
+    for batch in _batched(pending_chunks(), batch_size):
+        future = pool.submit(hashing_embed_batch, [chunk for _, _, chunk in batch]) if pool is not None else None
+        in_flight.append((batch, future))
+        if len(in_flight) >= max_in_flight:
+            _store_batch(db, document_id, *in_flight.pop(0), stats)
+    while in_flight:
+        _store_batch(db, document_id, *in_flight.pop(0), stats)
+
+    if reused:
+        db.bulk_update_mappings(KnowledgeChunk, reused)
+        stats["chunks_reused"] += len(reused)
+
+    # Whatever is left in `existing` no longer appears in the document (or
+    # appears fewer times than before)
+    stale_ids = [chunk_id for chunk_ids in existing.values() for chunk_id in chunk_ids]
+    for start in range(0, len(stale_ids), 500):
+        db.query(KnowledgeChunk).filter(KnowledgeChunk.id.in_(stale_ids[start:start + 500])).delete(
+            synchronize_session=False
+        )
+    stats["chunks_removed"] += len(stale_ids)
+
+    document = db.query(KnowledgeDocument).filter(KnowledgeDocument.id == document_id).first()
+    document.content_hash = document_hash
+    document.chunk_count = chunk_count
+    document.ingested_at = datetime.utcnow()
+    db.commit()
+    stats["documents_ingested"] += 1
+    logger.info(f"✓ INGEST: {path} ({chunk_count} chunks)")
+
+
+def _store_batch(db, document_id: int, batch: list, future, stats: dict):
+    """Waits for a batch's embeddings and commits its chunks."""
+    embeddings = future.result() if future is not None else embed_batch([chunk for _, _, chunk in batch])
+    db.bulk_insert_mappings(KnowledgeChunk, [
+        {
+            "document_id": document_id,
+            "chunk_index": position,
+            "content_hash": chunk_hash,
+            "text": chunk,
+            "embedding": embedding,
+        }
+        for (position, chunk_hash, chunk), embedding in zip(batch, embeddings)
+    ])
+    db.commit()
+    stats["chunks_embedded"] += len(batch)
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest a document corpus into the CompliOps knowledge base.")
+    parser.add_argument("directory", help="Directory containing PDF/HTML/Markdown files")
+    parser.add_argument("--batch-size", type=int, default=64, help="Chunks per embedding batch")
+    parser.add_argument("--workers", type=int, default=None, help="Embedding worker processes")
+    parser.add_argument("--prune", action="store_true", help="Remove documents whose files were deleted")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    stats = ingest_directory(args.directory, batch_size=args.batch_size, workers=args.workers, prune=args.prune)
+    for key, value in stats.items():
+        print(f"{key:>22}: {value}")
+
+
+if __name__ == "__main__":
+    main()
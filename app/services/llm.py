@@ -0,0 +1,241 @@
+"""LLM Service: Shared Gemini Invocation with Circuit Breaking, Hedging & Usage Accounting"""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+
+from app.config import (
+    get_llm,
+    LLM_BREAKER_FAILURE_RATE,
+    LLM_BREAKER_MIN_CALLS,
+    LLM_BREAKER_WINDOW_SECONDS,
+    LLM_BREAKER_OPEN_SECONDS,
+    LLM_HEDGE_AFTER_MS,
+)
+from app.services.profiling import span
+from app.services.ratelimit import llm_slot, record_token_usage
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# CIRCUIT BREAKER
+# ============================================================================
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the LLM while the circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Failure-rate circuit breaker shared by every LLM call site.
+
+    - closed: calls go through; outcomes are kept for a sliding time window
+    - open: calls fail fast with CircuitOpenError (callers fall back to mock)
+    - half_open: after the open period a single probe call is let through;
+      success closes the circuit, failure re-opens it
+    """
+
+    def __init__(self, failure_rate: float, min_calls: int, window_seconds: float, open_seconds: float):
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self._outcomes = deque()  # (timestamp, succeeded)
+        self._state = "closed"
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """Returns True if a call may be attempted now."""
+        with self._lock:
+            if self._state == "closed":
+                return True
+            if self._state == "open" and time.monotonic() - self._opened_at >= self.open_seconds:
+                self._state = "half_open"
+                self._probe_in_flight = False
+                logger.info("⚡ LLM circuit half-open: probing")
+            if self._state == "half_open" and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self._state == "half_open":
+                self._state = "closed"
+                self._outcomes.clear()
+                logger.info("✓ LLM circuit closed")
+            self._record(True)
+
+    def record_failure(self):
+        with self._lock:
+            if self._state == "half_open":
+                self._open()
+                return
+            self._record(False)
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            if (
+                self._state == "closed"
+                and len(self._outcomes) >= self.min_calls
+                and failures / len(self._outcomes) >= self.failure_rate
+            ):
+                self._open()
+
+    @contextmanager
+    def guard(self):
+        """
+        Runs the block as a protected call.
+
+        Raises:
+            CircuitOpenError: Without running the block while the circuit is open
+        """
+        if not self.allow_request():
+            raise CircuitOpenError("LLM circuit is open")
+        try:
+            yield
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+
+    def snapshot(self) -> dict:
+        """Current state for /health."""
+        with self._lock:
+            self._trim()
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            total = len(self._outcomes)
+            state = self._state
+            if state == "open" and time.monotonic() - self._opened_at >= self.open_seconds:
+                state = "half_open"
+            return {
+                "state": state,
+                "window_calls": total,
+                "window_failures": failures,
+                "failure_rate": round(failures / total, 3) if total else 0.0,
+            }
+
+    def _record(self, succeeded: bool):
+        self._outcomes.append((time.monotonic(), succeeded))
+        self._trim()
+
+    def _trim(self):
+        cutoff = time.monotonic() - self.window_seconds
+        while self._outcomes and self._outcomes[0][0] < cutoff:
+            self._outcomes.popleft()
+
+    def _open(self):
+        self._state = "open"
+        self._opened_at = time.monotonic()
+        self._probe_in_flight = False
+        logger.warning(f"⚠ LLM circuit OPEN for {self.open_seconds:.0f}s: falling back to mock responses")
+
+
+llm_breaker = CircuitBreaker(
+    failure_rate=LLM_BREAKER_FAILURE_RATE,
+    min_calls=LLM_BREAKER_MIN_CALLS,
+    window_seconds=LLM_BREAKER_WINDOW_SECONDS,
+    open_seconds=LLM_BREAKER_OPEN_SECONDS,
+)
+
+# Runs hedged attempts; sized for a couple of duplicates per in-flight call
+_hedge_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="llm-hedge")
+
+
+# ============================================================================
+# INVOCATION
+# ============================================================================
+
+def invoke_llm(prompt: str, tenant: str = "system", call: str = "llm"):
+    """
+    Invokes the shared Gemini client and charges the tokens to a tenant.
+
+    Fails fast with CircuitOpenError while the LLM circuit is open, so call
+    sites drop straight to their mock fallback instead of waiting for a
+    timeout. With LLM_HEDGE_AFTER_MS set, a duplicate request is sent when
+    the first is slow and whichever answers first wins.
+
+    Args:
+        prompt: Prompt text
+        tenant: Budget key the prompt/completion tokens are charged to
+        call: Label for the profiling span
+
+    Returns:
+        The LLM response message
+
+    Raises:
+        CircuitOpenError: If the circuit is open
+    """
+    with span("llm", call=call), llm_breaker.guard():
+        if LLM_HEDGE_AFTER_MS > 0:
+            return _invoke_hedged(prompt, tenant)
+        return _invoke_once(prompt, tenant)
+
+
+def _invoke_once(prompt: str, tenant: str):
+    llm = get_llm()
+    with llm_slot():
+        response = llm.invoke(prompt)
+
+    prompt_tokens, completion_tokens = count_tokens(prompt, response)
+    record_token_usage(tenant, prompt_tokens, completion_tokens)
+    return response
+
+
+def _invoke_hedged(prompt: str, tenant: str):
+    primary = _hedge_executor.submit(_invoke_once, prompt, tenant)
+    done, _ = wait([primary], timeout=LLM_HEDGE_AFTER_MS / 1000)
+    if done:
+        return primary.result()
+
+    logger.info(f"LLM: no answer after {LLM_HEDGE_AFTER_MS:.0f}ms, sending hedged request")
+    pending = {primary, _hedge_executor.submit(_invoke_once, prompt, tenant)}
+    error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            try:
+                return future.result()
+            except Exception as e:
+                error = e
+    raise error
+
+
+def count_tokens(prompt: str, response) -> tuple:
+    """
+    Extracts prompt/completion token counts from an LLM response.
+
+    Uses the usage metadata reported by Gemini when present and falls back
+    to a ~4 characters-per-token estimate otherwise.
+
+    Returns:
+        (prompt_tokens, completion_tokens)
+    """
+    usage = getattr(response, "usage_metadata", None) or {}
+    if usage.get("input_tokens") is not None:
+        return usage["input_tokens"], usage.get("output_tokens", 0)
+
+    metadata = (getattr(response, "response_metadata", None) or {}).get("usage_metadata") or {}
+    if metadata.get("prompt_token_count") is not None:
+        return metadata["prompt_token_count"], metadata.get("candidates_token_count", 0)
+
+    content = getattr(response, "content", "") or ""
+    return _estimate_tokens(prompt), _estimate_tokens(str(content))
+
+
+def record_crew_usage(tenant: str, crew_output) -> None:
+    """Charges the tokens reported by a crew.ai run to a tenant."""
+    usage = getattr(crew_output, "token_usage", None)
+    prompt_tokens = getattr(usage, "prompt_tokens", None)
+    completion_tokens = getattr(usage, "completion_tokens", None)
+    if prompt_tokens is None or completion_tokens is None:
+        prompt_tokens, completion_tokens = 0, _estimate_tokens(str(crew_output))
+    record_token_usage(tenant, prompt_tokens, completion_tokens)
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
@@ -0,0 +1,209 @@
+"""Profiling Service: Per-Request Span Trees & Slow-Request Capture"""
+
+import logging
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Optional
+
+from app.config import PROFILE_SAMPLE_RATE, PROFILE_SLOW_MS, PROFILE_BUFFER_SIZE
+
+logger = logging.getLogger(__name__)
+
+# Active span for the current request (None when the request is not profiled)
+_current_span: ContextVar[Optional["Span"]] = ContextVar("_current_span", default=None)
+
+# Bounded ring buffer of slow request profiles (oldest are dropped first)
+_slow_requests = deque(maxlen=PROFILE_BUFFER_SIZE)
+_slow_requests_lock = threading.Lock()
+
+
+# ============================================================================
+# SPANS
+# ============================================================================
+
+class Span:
+    """A timed section of a request. Spans nest to form a tree."""
+
+    __slots__ = ("name", "attributes", "children", "_start", "_end")
+
+    def __init__(self, name: str, **attributes):
+        self.name = name
+        self.attributes = attributes
+        self.children = []
+        self._start = time.perf_counter()
+        self._end = None
+
+    def finish(self):
+        if self._end is None:
+            self._end = time.perf_counter()
+
+    @property
+    def duration_ms(self) -> float:
+        end = self._end if self._end is not None else time.perf_counter()
+        return (end - self._start) * 1000
+
+    def to_dict(self, origin: Optional[float] = None) -> dict:
+        """Serialize the span tree, with offsets relative to the root span."""
+        origin = self._start if origin is None else origin
+        return {
+            "name": self.name,
+            "start_ms": round((self._start - origin) * 1000, 3),
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "children": [child.to_dict(origin) for child in self.children],
+        }
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """
+    Records a child span under the active request span.
+
+    When the current request is not being profiled this is a no-op,
+    so instrumented code pays only for a ContextVar lookup.
+
+    Usage:
+        with span("llm", model="gemini"):
+            response = llm.invoke(prompt)
+    """
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+
+    child = Span(name, **attributes)
+    parent.children.append(child)
+    token = _current_span.set(child)
+    try:
+        yield child
+    finally:
+        child.finish()
+        _current_span.reset(token)
+
+
+# ============================================================================
+# SLOW REQUEST BUFFER
+# ============================================================================
+
+def get_slow_requests(limit: int = 20, min_ms: float = 0) -> list:
+    """
+    Returns captured request profiles, newest first.
+
+    Args:
+        limit: Maximum number of profiles to return
+        min_ms: Only return requests at least this slow
+
+    Returns:
+        List of profile summaries (without span trees)
+    """
+    with _slow_requests_lock:
+        profiles = list(_slow_requests)
+
+    results = []
+    for profile in reversed(profiles):
+        if profile["duration_ms"] < min_ms:
+            continue
+        results.append({key: value for key, value in profile.items() if key != "spans"})
+        if len(results) >= limit:
+            break
+    return results
+
+
+def get_slow_request(profile_id: str) -> Optional[dict]:
+    """Returns a single captured profile, including its span tree."""
+    with _slow_requests_lock:
+        for profile in _slow_requests:
+            if profile["id"] == profile_id:
+                return profile
+    return None
+
+
+def clear_slow_requests():
+    """Empties the slow-request buffer."""
+    with _slow_requests_lock:
+        _slow_requests.clear()
+
+
+def _record(profile: dict):
+    with _slow_requests_lock:
+        _slow_requests.append(profile)
+
+
+# ============================================================================
+# ASGI MIDDLEWARE
+# ============================================================================
+
+class ProfilingMiddleware:
+    """
+    Opt-in request profiler.
+
+    A request is profiled when it carries an `X-Profile: 1` header or is
+    picked by PROFILE_SAMPLE_RATE. Profiled requests get an `X-Profile-Id`
+    response header; those slower than PROFILE_SLOW_MS (or explicitly
+    requested via header) are kept in the slow-request ring buffer.
+    Unprofiled requests pass straight through to the app.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        forced = _profile_header_set(scope)
+        if not forced and (PROFILE_SAMPLE_RATE <= 0 or random.random() >= PROFILE_SAMPLE_RATE):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex[:16]
+        root = Span(f"{scope['method']} {scope['path']}")
+        token = _current_span.set(root)
+        state = {"status": None, "response_ms": None}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                state["status"] = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"x-profile-id", profile_id.encode()))
+                message = {**message, "headers": headers}
+            elif message["type"] == "http.response.body" and not message.get("more_body"):
+                state["response_ms"] = root.duration_ms
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            root.finish()
+            _current_span.reset(token)
+
+            duration_ms = root.duration_ms
+            if forced or duration_ms >= PROFILE_SLOW_MS:
+                _record({
+                    "id": profile_id,
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status": state["status"],
+                    "duration_ms": round(duration_ms, 3),
+                    "response_ms": round(state["response_ms"], 3) if state["response_ms"] else None,
+                    "forced": forced,
+                    "timestamp": datetime.now().isoformat(),
+                    "spans": root.to_dict(),
+                })
+                logger.info(
+                    f"⏱ PROFILE: {scope['method']} {scope['path']} took {duration_ms:.1f}ms (ID: {profile_id})"
+                )
+
+
+def _profile_header_set(scope) -> bool:
+    for name, value in scope.get("headers", ()):
+        if name == b"x-profile":
+            return value.strip().lower() in (b"1", b"true", b"yes")
+    return False
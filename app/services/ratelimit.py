@@ -0,0 +1,300 @@
+"""Rate Limiting Service: Token Buckets, Daily LLM Budgets & Load Shedding"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from fastapi import Depends, HTTPException
+
+from app.config import (
+    RATE_LIMITS,
+    DAILY_TOKEN_BUDGET,
+    LLM_MAX_INFLIGHT,
+    RATE_LIMIT_BACKEND,
+    REDIS_URL,
+)
+from app.models.schemas import UserResponse
+from app.services.security import get_current_user
+
+logger = logging.getLogger(__name__)
+
+# Budget counters live a little longer than a day so late writes still land
+_BUDGET_TTL_SECONDS = 2 * 24 * 3600
+
+
+# ============================================================================
+# STORES
+# ============================================================================
+
+class InMemoryRateLimitStore:
+    """Token buckets and usage counters for a single worker process."""
+
+    def __init__(self):
+        self._buckets = {}
+        self._usage = {}
+        self._lock = threading.Lock()
+
+    def consume(self, key: str, rate_per_sec: float, capacity: int, cost: int = 1) -> float:
+        """
+        Takes `cost` tokens from the bucket for key.
+
+        Returns:
+            0 if allowed, otherwise seconds until enough tokens are available
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate_per_sec)
+            if tokens >= cost:
+                self._buckets[key] = (tokens - cost, now)
+                return 0.0
+            self._buckets[key] = (tokens, now)
+            return (cost - tokens) / rate_per_sec
+
+    def incr_usage(self, key: str, amount: int, ttl: int) -> int:
+        """Adds amount to a usage counter and returns the new total."""
+        now = time.time()
+        with self._lock:
+            total, expires_at = self._usage.get(key, (0, now + ttl))
+            if expires_at <= now:
+                total, expires_at = 0, now + ttl
+            total += amount
+            self._usage[key] = (total, expires_at)
+            return total
+
+    def get_usage(self, key: str) -> int:
+        """Returns the current value of a usage counter."""
+        with self._lock:
+            total, expires_at = self._usage.get(key, (0, 0))
+            return total if expires_at > time.time() else 0
+
+
+class RedisRateLimitStore:
+    """
+    Token buckets and usage counters shared by all workers through Redis.
+
+    While Redis is unreachable, limits and usage are enforced per worker by an
+    in-memory store instead of failing the request; Redis is retried at most
+    every _RETRY_SECONDS, so requests do not each wait out a socket timeout.
+    """
+
+    _RETRY_SECONDS = 30
+
+    # KEYS[1] = bucket key; ARGV = rate_per_sec, capacity, cost, now
+    _CONSUME_SCRIPT = """
+    local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+    local rate = tonumber(ARGV[1])
+    local capacity = tonumber(ARGV[2])
+    local cost = tonumber(ARGV[3])
+    local now = tonumber(ARGV[4])
+    local tokens = tonumber(bucket[1]) or capacity
+    local updated = tonumber(bucket[2]) or now
+    tokens = math.min(capacity, tokens + (now - updated) * rate)
+    local wait = 0
+    if tokens >= cost then
+        tokens = tokens - cost
+    else
+        wait = (cost - tokens) / rate
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+    return tostring(wait)
+    """
+
+    def __init__(self, url: str):
+        import redis
+
+        self._errors = redis.RedisError
+        self._redis = redis.Redis.from_url(url, socket_connect_timeout=1, socket_timeout=1)
+        self._redis.ping()  # from_url() does not connect
+        self._consume = self._redis.register_script(self._CONSUME_SCRIPT)
+        self._fallback = InMemoryRateLimitStore()
+        self._retry_at = None  # monotonic time of the next Redis attempt while degraded
+
+    def _call(self, method: str, primary, *args):
+        if self._retry_at is not None and time.monotonic() < self._retry_at:
+            return getattr(self._fallback, method)(*args)
+        try:
+            result = primary()
+        except self._errors as e:
+            if self._retry_at is None:
+                logger.warning(f"⚠ Redis rate-limit store unreachable: {e}. Using in-memory limits.")
+            self._retry_at = time.monotonic() + self._RETRY_SECONDS
+            return getattr(self._fallback, method)(*args)
+        if self._retry_at is not None:
+            logger.info("✓ Redis rate-limit store reachable again")
+            self._retry_at = None
+        return result
+
+    def consume(self, key: str, rate_per_sec: float, capacity: int, cost: int = 1) -> float:
+        return self._call(
+            "consume",
+            lambda: float(self._consume(keys=[f"ratelimit:{key}"], args=[rate_per_sec, capacity, cost, time.time()])),
+            key, rate_per_sec, capacity, cost,
+        )
+
+    def incr_usage(self, key: str, amount: int, ttl: int) -> int:
+        def incr():
+            pipe = self._redis.pipeline()
+            pipe.incrby(f"usage:{key}", amount)
+            pipe.expire(f"usage:{key}", ttl)
+            total, _ = pipe.execute()
+            return int(total)
+
+        return self._call("incr_usage", incr, key, amount, ttl)
+
+    def get_usage(self, key: str) -> int:
+        return self._call("get_usage", lambda: int(self._redis.get(f"usage:{key}") or 0), key)
+
+
+def _create_store():
+    if RATE_LIMIT_BACKEND == "redis":
+        try:
+            store = RedisRateLimitStore(REDIS_URL)
+            logger.info("✓ Rate limiting using Redis store")
+            return store
+        except Exception as e:
+            logger.warning(f"⚠ Redis rate-limit store unavailable: {e}. Falling back to in-memory.")
+    return InMemoryRateLimitStore()
+
+
+store = _create_store()
+
+
+# ============================================================================
+# LLM TOKEN BUDGETS
+# ============================================================================
+
+def _budget_key(tenant: str) -> str:
+    return f"tokens:{tenant}:{datetime.now(timezone.utc).strftime('%Y-%m-%d')}"
+
+
+def record_token_usage(tenant: str, prompt_tokens: int, completion_tokens: int) -> int:
+    """
+    Adds counted LLM tokens to the tenant's budget for the current UTC day.
+
+    Returns:
+        Total tokens used by the tenant today
+    """
+    total = store.incr_usage(_budget_key(tenant), int(prompt_tokens) + int(completion_tokens), _BUDGET_TTL_SECONDS)
+    logger.debug(f"LLM usage for {tenant}: +{prompt_tokens}/{completion_tokens} tokens (today: {total})")
+    return total
+
+
+def get_token_usage(tenant: str) -> dict:
+    """Returns today's token usage and remaining budget for a tenant."""
+    used = store.get_usage(_budget_key(tenant))
+    return {"used": used, "budget": DAILY_TOKEN_BUDGET, "remaining": max(0, DAILY_TOKEN_BUDGET - used)}
+
+
+def tenant_for(user: UserResponse) -> str:
+    """Budget/rate-limit key for an authenticated user."""
+    return f"user:{user.id}"
+
+
+# ============================================================================
+# LOAD SHEDDING
+# ============================================================================
+
+_inflight = 0
+_inflight_lock = threading.Lock()
+
+
+@contextmanager
+def llm_slot():
+    """
+    Counts an LLM call as in flight for the duration of the block.
+
+    Usage:
+        with llm_slot():
+            response = llm.invoke(prompt)
+    """
+    global _inflight
+    with _inflight_lock:
+        _inflight += 1
+    try:
+        yield
+    finally:
+        with _inflight_lock:
+            _inflight -= 1
+
+
+def llm_inflight() -> int:
+    """Number of LLM calls currently in flight in this process."""
+    return _inflight
+
+
+# ============================================================================
+# FASTAPI DEPENDENCY
+# ============================================================================
+
+def rate_limit(route: str):
+    """
+    Builds a dependency enforcing check_rate_limit() for one request to `route`.
+
+    A plain def, so FastAPI runs it in the thread pool: with the Redis store
+    the checks are blocking network calls.
+    """
+    def dependency(current_user: UserResponse = Depends(get_current_user)) -> UserResponse:
+        check_rate_limit(current_user, route)
+        return current_user
+
+    return dependency
+
+
+def check_rate_limit(current_user: UserResponse, route: str, cost: int = 1):
+    """
+    Enforces, in order:
+    1. The per-user token bucket for `route` (RATE_LIMITS), charging `cost` tokens
+    2. The user's daily LLM token budget (DAILY_TOKEN_BUDGET)
+    3. The in-flight LLM call ceiling (LLM_MAX_INFLIGHT)
+
+    Each check rejects with 429 and a Retry-After header before any LLM work
+    starts. Endpoints that start several LLM jobs per request (batches) call
+    this directly with cost set to the number of jobs.
+
+    Raises:
+        HTTPException 400: cost exceeds the route's burst, so it can never be admitted
+        HTTPException 429: A limit was hit
+    """
+    per_minute, burst = RATE_LIMITS[route]
+    rate_per_sec = per_minute / 60.0
+    tenant = tenant_for(current_user)
+
+    if cost > burst:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Request needs {cost} {route} tokens but the limit allows at most {burst} at once",
+        )
+
+    retry_after = store.consume(f"{tenant}:{route}", rate_per_sec, burst, cost)
+    if retry_after > 0:
+        logger.info(f"⚠ RATE LIMIT: {tenant} exceeded {route} limit")
+        raise HTTPException(
+            status_code=429,
+            detail=f"Rate limit exceeded for {route}",
+            headers={"Retry-After": str(max(1, int(retry_after + 0.999)))},
+        )
+
+    if get_token_usage(tenant)["remaining"] <= 0:
+        logger.info(f"⚠ BUDGET: {tenant} exhausted daily LLM token budget")
+        raise HTTPException(
+            status_code=429,
+            detail="Daily LLM token budget exhausted",
+            headers={"Retry-After": str(_seconds_until_utc_midnight())},
+        )
+
+    if llm_inflight() >= LLM_MAX_INFLIGHT:
+        logger.warning(f"⚠ LOAD SHED: {llm_inflight()} LLM calls in flight, rejecting {route}")
+        raise HTTPException(
+            status_code=429,
+            detail="Service busy, please retry shortly",
+            headers={"Retry-After": "5"},
+        )
+
+
+def _seconds_until_utc_midnight() -> int:
+    now = datetime.now(timezone.utc)
+    return 24 * 3600 - (now.hour * 3600 + now.minute * 60 + now.second)
@@ -0,0 +1,131 @@
+"""
+Report Sections Service: Incremental Report Generation
+
+Reports are stored as addressable sections (REPORT_SECTIONS). Each section
+records a hash of exactly the inputs it depends on — alert summary, impact
+level, analysis and/or company data — plus the generator that produced it
+(LLM or mock) and SECTION_VERSION. When a report is generated, sections
+whose hash matches an earlier section are copied instead of regenerated,
+so only the sections whose inputs changed cost LLM calls.
+"""
+
+import hashlib
+import json
+import logging
+from typing import Callable, Dict, Iterable, List
+
+from app.agents import REPORT_SECTIONS
+from app.models.database import ReportSection
+
+logger = logging.getLogger(__name__)
+
+# Bump when section prompts or mock templates change, so stored sections are not reused
+SECTION_VERSION = 1
+
+# Inputs each section is generated from
+SECTION_INPUTS = {
+    "executive_summary": ("summary", "impact", "company"),
+    "findings": ("summary", "analysis"),
+    "risk": ("impact", "analysis", "company"),
+    "recommendations": ("summary", "impact", "company"),
+}
+
+SECTION_TITLES = dict(REPORT_SECTIONS)
+
+
+def section_inputs(alert, company_data: dict) -> dict:
+    """Collects every input a report section can depend on."""
+    impact_json = dict(alert.impact_json or {})
+    return {
+        "summary": alert.summary,
+        "impact": impact_json.get("impact", "Medium"),
+        "analysis": {key: value for key, value in impact_json.items() if key != "impact"},
+        "company": company_data,
+    }
+
+
+def section_hash(key: str, generator: str, inputs: dict) -> str:
+    """Hash of the inputs a section depends on (and the generator that writes it)."""
+    material = {
+        "section": key,
+        "version": SECTION_VERSION,
+        "generator": generator,
+        "inputs": {name: inputs[name] for name in SECTION_INPUTS[key]},
+    }
+    return hashlib.sha256(json.dumps(material, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def build_sections(
+    db,
+    inputs: dict,
+    generator: str,
+    generate: Callable[[List[str]], Dict[str, str]],
+    force: bool = False,
+) -> List[dict]:
+    """
+    Returns every report section, reusing stored ones whose inputs are unchanged.
+
+    Args:
+        db: Database session
+        inputs: Output of section_inputs()
+        generator: "llm" or "mock" (part of the hash, so mock content never
+            stands in for LLM content)
+        generate: Called once with the keys that need (re)generating;
+            returns section key -> Markdown
+        force: Regenerate every section
+
+    Returns:
+        List of {"key", "title", "position", "input_hash", "content", "reused"} in document order
+    """
+    hashes = {key: section_hash(key, generator, inputs) for key, _ in REPORT_SECTIONS}
+
+    reusable = {}
+    if not force:
+        for input_hash, content in (
+            db.query(ReportSection.input_hash, ReportSection.content)
+            .filter(ReportSection.input_hash.in_(list(hashes.values())))
+            .order_by(ReportSection.id.desc())
+        ):
+            reusable.setdefault(input_hash, content)
+
+    changed = [key for key, _ in REPORT_SECTIONS if hashes[key] not in reusable]
+    generated = generate(changed) if changed else {}
+    missing = [key for key in changed if not generated.get(key)]
+    if missing:
+        raise ValueError(f"Section generation returned no content for: {', '.join(missing)}")
+
+    logger.info(
+        f"✓ EXECUTOR: {len(REPORT_SECTIONS) - len(changed)} section(s) reused, "
+        f"{len(changed)} generated ({generator})"
+    )
+    return [
+        {
+            "key": key,
+            "title": title,
+            "position": position,
+            "input_hash": hashes[key],
+            "content": generated[key] if key in generated else reusable[hashes[key]],
+            "reused": key not in generated,
+        }
+        for position, (key, title) in enumerate(REPORT_SECTIONS)
+    ]
+
+
+def save_sections(db, report_id: int, sections: Iterable[dict]):
+    """Replaces a report's stored sections (caller commits)."""
+    db.query(ReportSection).filter(ReportSection.report_id == report_id).delete(synchronize_session=False)
+    db.add_all(ReportSection(report_id=report_id, **section) for section in sections)
+
+
+def section_task_description(key: str, alert, company_data: dict) -> str:
+    """Prompt for the report writer to produce a single section."""
+    inputs = section_inputs(alert, company_data)
+    context = "\n".join(
+        f"{name.capitalize()}: {json.dumps(inputs[name], default=str) if isinstance(inputs[name], dict) else inputs[name]}"
+        for name in SECTION_INPUTS[key]
+    )
+    return f"""Write the "{SECTION_TITLES[key]}" section of a compliance report in Markdown.
+
+    {context}
+
+    Start with the heading "## {SECTION_TITLES[key]}" and write only this section."""
@@ -0,0 +1,331 @@
+"""
+Retention Service: Archival of Cold Alerts/Reports & Database Compaction
+
+Rows matching RETENTION_POLICIES are moved, RETENTION_BATCH_SIZE at a time,
+into the archive tables as zlib-compressed JSON. Each batch is its own short
+transaction (insert into archive + delete from live table), so Watchtower
+and API writes are never blocked for long. Archived rows stay readable
+through GET /alerts/{id} and GET /reports/{id}, and are included in exports.
+
+Deleting live rows also removes them from the full-text index (FTS5
+triggers). Dashboard aggregates are keyed by creation time and deliberately
+keep counting archived rows.
+
+Compaction runs after archival: SQLite reclaims free pages with
+PRAGMA incremental_vacuum in small steps and refreshes planner statistics
+with PRAGMA optimize; Postgres tables are ANALYZEd (autovacuum reclaims space).
+
+CLI:
+    python -m app.services.retention [--vacuum-full]
+"""
+
+import argparse
+import json
+import logging
+import zlib
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import text
+
+from app.config import RETENTION_POLICIES, RETENTION_BATCH_SIZE, RETENTION_VACUUM_PAGES
+from app.models.database import (
+    SessionLocal,
+    ComplianceAlert,
+    GeneratedReport,
+    ReportSection,
+    ArchivedAlert,
+    ArchivedReport,
+    engine,
+    init_db,
+)
+from app.models.schemas import ComplianceAlertResponse, GeneratedReportResponse
+from app.services.http_cache import response_cache
+from app.services.serialization import dumps, model_columns, rows_to_dicts
+
+logger = logging.getLogger(__name__)
+
+
+def _compress(row: dict) -> bytes:
+    return zlib.compress(dumps(row), 6)
+
+
+def decompress_payload(payload: bytes) -> dict:
+    """Decodes an archive payload back into the resource's response dict."""
+    return json.loads(zlib.decompress(payload))
+
+
+# ============================================================================
+# ARCHIVAL
+# ============================================================================
+
+def _alert_filters(policy: dict, cutoff: datetime) -> list:
+    filters = [ComplianceAlert.created_at < cutoff]
+    if not policy.get("include_open"):
+        filters.append(ComplianceAlert.action_required.is_(False))
+    return filters
+
+
+def _report_filters(policy: dict, cutoff: datetime) -> list:
+    filters = [GeneratedReport.created_at < cutoff]
+    if policy.get("statuses"):
+        filters.append(GeneratedReport.status.in_(policy["statuses"]))
+    return filters
+
+
+def archive_alerts(policy: Optional[dict] = None, batch_size: int = RETENTION_BATCH_SIZE, now: Optional[datetime] = None) -> int:
+    """
+    Moves alerts matching the retention policy into archived_alerts.
+
+    Returns:
+        Number of alerts archived
+    """
+    policy = policy or RETENTION_POLICIES["alerts"]
+    if not policy.get("days"):
+        return 0
+    cutoff = (now or datetime.utcnow()) - timedelta(days=policy["days"])
+    filters = _alert_filters(policy, cutoff)
+
+    def archive_row(row: dict) -> dict:
+        return {
+            "id": row["id"],
+            "impact": (row["impact_json"] or {}).get("impact"),
+            "action_required": row["action_required"],
+            "created_at": row["created_at"],
+            "payload": _compress(row),
+        }
+
+    return _move_in_batches(ComplianceAlertResponse, ComplianceAlert, ArchivedAlert, filters, archive_row, batch_size)
+
+
+def archive_reports(policy: Optional[dict] = None, batch_size: int = RETENTION_BATCH_SIZE, now: Optional[datetime] = None) -> int:
+    """
+    Moves reports matching the retention policy into archived_reports.
+
+    Returns:
+        Number of reports archived
+    """
+    policy = policy or RETENTION_POLICIES["reports"]
+    if not policy.get("days"):
+        return 0
+    cutoff = (now or datetime.utcnow()) - timedelta(days=policy["days"])
+    filters = _report_filters(policy, cutoff)
+
+    def archive_row(row: dict) -> dict:
+        return {
+            "id": row["id"],
+            "alert_id": row["alert_id"],
+            "status": row["status"],
+            "created_at": row["created_at"],
+            "payload": _compress(row),
+        }
+
+    # A report's sections are folded into its archived content_markdown
+    return _move_in_batches(
+        GeneratedReportResponse, GeneratedReport, ArchivedReport, filters, archive_row, batch_size,
+        dependents=(ReportSection.report_id,),
+    )
+
+
+def _move_in_batches(model, orm_class, archive_class, filters: list, archive_row, batch_size: int, dependents=()) -> int:
+    """
+    Copies matching rows to the archive and deletes them (plus rows in
+    `dependents`, given as foreign-key columns), one short transaction per batch.
+
+    Archive entries are never overwritten. A live row whose id is already
+    archived (possible in SQLite databases created before the live tables
+    used AUTOINCREMENT) is left in place and logged.
+    """
+    resource = "alert" if orm_class is ComplianceAlert else "report"
+    moved = 0
+    collisions = []
+    db = SessionLocal()
+    try:
+        while True:
+            query = db.query(*model_columns(model, orm_class)).filter(*filters)
+            if collisions:
+                query = query.filter(orm_class.id.notin_(collisions))
+            rows = rows_to_dicts(model, query.order_by(orm_class.id).limit(batch_size).all())
+            if not rows:
+                break
+            archived = {
+                archive_id
+                for (archive_id,) in db.query(archive_class.id).filter(archive_class.id.in_([row["id"] for row in rows]))
+            }
+            if archived:
+                logger.error(
+                    f"✗ RETENTION: {orm_class.__tablename__} ids {sorted(archived)} are already archived; "
+                    "keeping the live rows"
+                )
+                collisions.extend(archived)
+                rows = [row for row in rows if row["id"] not in archived]
+                if not rows:
+                    continue
+            ids = [row["id"] for row in rows]
+            db.bulk_insert_mappings(archive_class, [archive_row(row) for row in rows])
+            for foreign_key in dependents:
+                db.query(foreign_key.class_).filter(foreign_key.in_(ids)).delete(synchronize_session=False)
+            db.query(orm_class).filter(orm_class.id.in_(ids)).delete(synchronize_session=False)
+            db.commit()
+            # Bulk deletes bypass the mapper events that invalidate cached bodies
+            for resource_id in ids:
+                response_cache.invalidate((resource, resource_id))
+            moved += len(rows)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    return moved
+
+
+def load_archived(resource: str, resource_id: int) -> Optional[dict]:
+    """
+    Looks up an archived alert or report by its original id.
+
+    Returns:
+        The response dict as it was when archived, or None
+    """
+    archive_class = ArchivedAlert if resource == "alert" else ArchivedReport
+    db = SessionLocal()
+    try:
+        payload = db.query(archive_class.payload).filter(archive_class.id == resource_id).scalar()
+    finally:
+        db.close()
+    return decompress_payload(payload) if payload is not None else None
+
+
+def iter_archived_batches(resource: str, since=None, until=None, impact=None, status=None, batch_size: int = 1000):
+    """Yields archived rows (as response dicts) matching the export filters, in id order."""
+    archive_class = ArchivedAlert if resource == "alerts" else ArchivedReport
+    db = SessionLocal()
+    try:
+        query = db.query(archive_class.payload)
+        if since is not None:
+            query = query.filter(archive_class.created_at >= since)
+        if until is not None:
+            query = query.filter(archive_class.created_at < until)
+        if impact is not None and resource == "alerts":
+            query = query.filter(ArchivedAlert.impact == impact)
+        if status is not None and resource == "reports":
+            query = query.filter(ArchivedReport.status == status)
+
+        batch = []
+        for (payload,) in query.order_by(archive_class.id).yield_per(batch_size):
+            row = decompress_payload(payload)
+            row["created_at"] = datetime.fromisoformat(row["created_at"])
+            batch.append(row)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    finally:
+        db.close()
+
+
+# ============================================================================
+# COMPACTION
+# ============================================================================
+
+def compact_database(vacuum_pages: int = RETENTION_VACUUM_PAGES) -> dict:
+    """
+    Reclaims free space and refreshes planner statistics without long locks.
+
+    Returns:
+        Dict with pages reclaimed (SQLite) and whether statistics were refreshed
+    """
+    result = {"pages_reclaimed": 0, "analyzed": False}
+    if engine.dialect.name == "sqlite":
+        raw = engine.raw_connection()
+        try:
+            # executescript steps each statement to completion; a plain execute()
+            # of PRAGMA incremental_vacuum would only free a single page
+            sqlite = raw.driver_connection
+            if sqlite.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:  # INCREMENTAL
+                while True:
+                    free_pages = sqlite.execute("PRAGMA freelist_count").fetchone()[0]
+                    if not free_pages:
+                        break
+                    # Each step is its own short write transaction
+                    step = min(free_pages, vacuum_pages)
+                    sqlite.executescript(f"PRAGMA incremental_vacuum({step})")
+                    result["pages_reclaimed"] += step
+            else:
+                logger.warning(
+                    "⚠ RETENTION: Database was created without incremental auto-vacuum; "
+                    "run `python -m app.services.retention --vacuum-full` once during a quiet period"
+                )
+            for fts in ("compliance_alerts_fts", "generated_reports_fts"):
+                if sqlite.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts,)).fetchone():
+                    # Bounded amount of FTS5 segment merging per run
+                    sqlite.executescript(f"INSERT INTO {fts}({fts}, rank) VALUES ('merge', 500)")
+            sqlite.executescript("PRAGMA optimize")
+            result["analyzed"] = True
+        finally:
+            raw.close()
+    elif engine.dialect.name == "postgresql":
+        with engine.connect() as conn:
+            for table in ("compliance_alerts", "generated_reports", "archived_alerts", "archived_reports"):
+                conn.execute(text(f"ANALYZE {table}"))
+            conn.commit()
+            result["analyzed"] = True
+    return result
+
+
+def vacuum_full():
+    """
+    Rewrites the SQLite file with incremental auto-vacuum enabled.
+
+    Takes an exclusive lock for the duration; only needed once for
+    databases created before retention existed.
+    """
+    if engine.dialect.name != "sqlite":
+        raise RuntimeError("vacuum_full is only supported on SQLite")
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("PRAGMA auto_vacuum = INCREMENTAL"))
+        conn.execute(text("VACUUM"))
+
+
+def run_retention() -> dict:
+    """
+    Archives cold alerts/reports according to RETENTION_POLICIES, then compacts.
+
+    Scheduled by the Watchtower scheduler every RETENTION_INTERVAL_HOURS.
+    """
+    started = datetime.now()
+    stats = {"alerts_archived": 0, "reports_archived": 0}
+    try:
+        stats["alerts_archived"] = archive_alerts()
+        stats["reports_archived"] = archive_reports()
+        stats.update(compact_database())
+    except Exception as e:
+        logger.error(f"✗ RETENTION: Run failed: {e}")
+        stats["error"] = str(e)
+    stats["duration_seconds"] = round((datetime.now() - started).total_seconds(), 2)
+    logger.info(f"✓ RETENTION: {stats}")
+    return stats
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive cold CompliOps alerts/reports and compact the database.")
+    parser.add_argument(
+        "--vacuum-full", action="store_true", help="Enable incremental auto-vacuum with a one-time full VACUUM (SQLite)"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    init_db()
+    if args.vacuum_full:
+        vacuum_full()
+    stats = run_retention()
+    for key, value in stats.items():
+        print(f"{key:>18}: {value}")
+
+
+if __name__ == "__main__":
+    main()
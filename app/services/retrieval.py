@@ -0,0 +1,425 @@
+"""Retrieval Service: Hybrid BM25 + Vector Index over the Ingested Knowledge Base"""
+
+import heapq
+import logging
+import math
+import threading
+import time
+from array import array
+from collections import Counter
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import func
+
+from app.config import KNOWLEDGE_INDEX_CHECK_SECONDS
+from app.models.database import SessionLocal, KnowledgeChunk, KnowledgeDocument
+from app.services.embeddings import embed_query, tokenize
+from app.services.profiling import span
+
+try:
+    import numpy as np
+except ImportError:  # pure-Python scoring fallback
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Reciprocal-rank fusion constant and candidates taken from each ranking
+RRF_K = 60
+RRF_CANDIDATES = 20
+
+# Query terms in at most max(RARE_TERM_MIN_DF, RARE_TERM_DF_FRACTION * chunks)
+# chunks are "exact" terms (circular numbers, amounts, codes): chunks containing
+# them are ranked ahead of the fused results instead of competing with vector hits
+RARE_TERM_MIN_DF = 3
+RARE_TERM_DF_FRACTION = 0.02
+
+# Minimum evidence for a hit to count as relevant (see is_relevant)
+MIN_LEXICAL_SCORE = 1.0
+MIN_SIMILARITY = 0.35
+
+# Ignored in queries: they match almost every chunk and say nothing about the topic
+STOPWORDS = frozenset("""
+a about above after again all also am an and any are as at be been before being below between both but by
+can could did do does doing during each explain few for from further give had has have having he her here
+how i if in into is it its itself just me more most my no nor not of off on once only or other our out over
+own please same say says she should show so some such tell than that the their them then there these they
+this those through to too under until up very was we were what when where which while who whom why will
+with would you your
+""".split())
+
+# Above this many chunks, vector search probes the nearest clusters instead of scanning everything
+VECTOR_EXACT_LIMIT = 20000
+VECTOR_NPROBE = 8
+
+
+class KnowledgeIndex:
+    """
+    Read-only snapshot of all knowledge chunks: a BM25 inverted index and
+    the chunk embeddings.
+
+    Built from the database in one pass and swapped in atomically, so
+    searches never see a half-loaded index. Postings are compact arrays
+    (chunk positions as uint32, precomputed BM25 term impacts as float32)
+    rather than per-posting Python objects, so scoring a query term is a
+    single scatter-add. Large indexes also get a coarse cluster assignment
+    so vector search only scans the clusters nearest to the query.
+    """
+
+    def __init__(self):
+        self.chunk_ids = []
+        self.texts = []
+        self.sources = []
+        self._vectors = []  # list of float32 arrays (no numpy) ...
+        self._matrix = None  # ... or an (n, dim) float32 matrix
+
+        # BM25: term -> (chunk positions, term frequencies), turned into
+        # (chunk positions, term impacts) once all chunk lengths are known
+        self._postings = {}
+        self._lengths = array("I")
+
+        # Coarse clusters for large indexes: centroid matrix + member positions per cluster
+        self._centroids = None
+        self._clusters = None
+
+    @classmethod
+    def load(cls, batch_size: int = 2000) -> "KnowledgeIndex":
+        """Loads every chunk from the database."""
+        db = SessionLocal()
+        try:
+            rows = (
+                db.query(KnowledgeChunk.id, KnowledgeChunk.text, KnowledgeChunk.embedding, KnowledgeDocument.path)
+                .join(KnowledgeDocument, KnowledgeDocument.id == KnowledgeChunk.document_id)
+                .order_by(KnowledgeChunk.id)
+                .yield_per(batch_size)
+            )
+            return cls.from_chunks(rows)
+        finally:
+            db.close()
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[Tuple[int, str, bytes, str]]) -> "KnowledgeIndex":
+        """
+        Builds an index from (chunk_id, text, embedding_bytes, source) tuples.
+
+        Chunks whose embedding dimension differs from the first one (ingested
+        with another embedding backend) are skipped.
+        """
+        index = cls()
+        dim = None
+        raw = bytearray()
+
+        for chunk_id, text, embedding, source in chunks:
+            if not embedding:
+                continue
+            if dim is None:
+                dim = len(embedding) // 4
+            if len(embedding) // 4 != dim:
+                continue
+            index._add_postings(len(index.chunk_ids), text)
+            index.chunk_ids.append(chunk_id)
+            index.texts.append(text)
+            index.sources.append(source)
+            if np is not None:
+                raw.extend(embedding)
+            else:
+                index._vectors.append(array("f", embedding))
+
+        if np is not None and index.chunk_ids:
+            index._matrix = np.frombuffer(bytes(raw), dtype=np.float32).reshape(len(index.chunk_ids), dim)
+        index._finalize_postings()
+        if index._matrix is not None and len(index) > VECTOR_EXACT_LIMIT:
+            index._build_clusters()
+        return index
+
+    def _add_postings(self, position: int, text: str):
+        terms = Counter(tokenize(text))
+        self._lengths.append(sum(terms.values()))
+        for term, frequency in terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = (array("I"), array("H"))
+            postings[0].append(position)
+            postings[1].append(min(frequency, 65535))
+
+    def _finalize_postings(self):
+        """Replaces term frequencies with BM25 impacts: idf * tf * (k1 + 1) / (tf + k1 * length_norm)."""
+        total = len(self._lengths)
+        if not total:
+            return
+        avg_length = sum(self._lengths) / total
+        length_norm = [BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length) for length in self._lengths]
+
+        for term, (positions, frequencies) in self._postings.items():
+            idf = math.log(1 + (total - len(positions) + 0.5) / (len(positions) + 0.5))
+            impacts = array("f", (
+                idf * tf * (BM25_K1 + 1) / (tf + length_norm[position])
+                for position, tf in zip(positions, frequencies)
+            ))
+            if np is not None:
+                self._postings[term] = (np.frombuffer(positions, dtype=np.uint32), np.frombuffer(impacts, dtype=np.float32))
+            else:
+                self._postings[term] = (positions, impacts)
+
+    def _build_clusters(self, iterations: int = 3, batch_size: int = 8192):
+        """Assigns chunks to ~sqrt(n) clusters with a few rounds of spherical k-means."""
+        count = len(self._matrix)
+        clusters = int(math.sqrt(count))
+        rng = np.random.default_rng(0)
+        centroids = self._matrix[rng.choice(count, clusters, replace=False)].copy()
+
+        for _ in range(iterations):
+            assignment = np.concatenate([
+                np.argmax(self._matrix[start:start + batch_size] @ centroids.T, axis=1)
+                for start in range(0, count, batch_size)
+            ])
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, self._matrix)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = np.where(norms > 0, sums / np.maximum(norms, 1e-12), centroids)
+
+        order = np.argsort(assignment, kind="stable")
+        bounds = np.searchsorted(assignment[order], np.arange(clusters + 1))
+        self._centroids = centroids.astype(np.float32)
+        self._clusters = [order[bounds[c]:bounds[c + 1]] for c in range(clusters)]
+
+    def __len__(self) -> int:
+        return len(self.chunk_ids)
+
+    def lexical_search(self, query: str, k: int = 3) -> List[dict]:
+        """
+        Ranks chunks by BM25 over exact terms (circular numbers, amounts, acronyms).
+
+        Returns:
+            List of {"chunk_id", "text", "source", "score"} dicts, best first
+        """
+        return [self._hit(i, score) for score, i in self._lexical_ranking(query, k)]
+
+    def _query_terms(self, query: str) -> List[str]:
+        return [term for term in set(tokenize(query)) if term in self._postings and term not in STOPWORDS]
+
+    def _lexical_ranking(self, query: str, k: int) -> List[Tuple[float, int]]:
+        terms = self._query_terms(query)
+        if not terms:
+            return []
+
+        if np is not None:
+            scores = np.zeros(len(self.chunk_ids), dtype=np.float32)
+            for term in terms:
+                positions, impacts = self._postings[term]
+                scores[positions] += impacts
+            candidates = np.flatnonzero(scores)
+            k = min(k, len(candidates))
+            if k == 0:
+                return []
+            top = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+            ranked = sorted(((float(scores[i]), int(i)) for i in top), reverse=True)
+        else:
+            accumulator = {}
+            for term in terms:
+                positions, impacts = self._postings[term]
+                for position, impact in zip(positions, impacts):
+                    accumulator[position] = accumulator.get(position, 0.0) + impact
+            ranked = heapq.nlargest(k, ((score, i) for i, score in accumulator.items()))
+        return ranked
+
+    def hybrid_search(self, query: str, k: int = 3) -> List[dict]:
+        """
+        Fuses the BM25 and vector rankings with reciprocal-rank fusion.
+
+        Each chunk scores sum(1 / (RRF_K + rank)) over the rankings it
+        appears in, so semantic matches surface alongside lexical ones.
+        Chunks containing the query's rare terms (see RARE_TERM_DF_FRACTION)
+        come first, so an exact circular number or amount is never outranked
+        by a chunk that only looks similar. Falls back to BM25 alone if the
+        query cannot be embedded.
+
+        Returns:
+            List of hit dicts, best first. "score" is the fused RRF score,
+            "bm25" the lexical score (0 when no query term matched),
+            "similarity" the cosine similarity (None outside the vector
+            candidates) and "exact" whether the chunk contains a rare term.
+        """
+        with span("retrieval.bm25"):
+            lexical = self._lexical_ranking(query, RRF_CANDIDATES)
+            exact = self._exact_matches(query, k)
+        rankings = [lexical]
+        try:
+            with span("retrieval.vector"):
+                rankings.append([(score, i) for score, i in self._vector_ranking(query, RRF_CANDIDATES) if score > 0])
+        except Exception as e:
+            logger.warning(f"⚠ RETRIEVAL: Vector search failed: {e}. Using BM25 only.")
+
+        fused = {}
+        for ranking in rankings:
+            for rank, (_, i) in enumerate(ranking, start=1):
+                fused[i] = fused.get(i, 0.0) + 1.0 / (RRF_K + rank)
+        bm25 = {i: score for score, i in lexical}
+        similarity = {i: score for score, i in rankings[1]} if len(rankings) > 1 else {}
+
+        ranked = list(exact)
+        ranked += [i for i, _ in heapq.nlargest(k + len(exact), fused.items(), key=lambda item: item[1]) if i not in exact]
+        return [
+            {
+                **self._hit(i, fused.get(i, 0.0)),
+                "bm25": bm25.get(i, exact.get(i, 0.0)),
+                "similarity": similarity.get(i),
+                "exact": i in exact,
+            }
+            for i in ranked[:k]
+        ]
+
+    def _exact_matches(self, query: str, k: int) -> dict:
+        """
+        Up to k chunks containing the query's rare terms, ranked by how many
+        rare terms they contain, then by those terms' BM25 impact.
+
+        Returns:
+            Ordered dict of chunk position -> BM25 impact of the matched rare terms
+        """
+        max_df = max(RARE_TERM_MIN_DF, RARE_TERM_DF_FRACTION * len(self))
+        matched = {}
+        for term in self._query_terms(query):
+            positions, impacts = self._postings[term]
+            if len(positions) > max_df:
+                continue
+            for position, impact in zip(positions.tolist(), impacts.tolist()):
+                count, total = matched.get(position, (0, 0.0))
+                matched[position] = (count + 1, total + impact)
+        best = heapq.nlargest(k, matched.items(), key=lambda item: item[1])
+        return {position: total for position, (_, total) in best}
+
+    def _hit(self, i: int, score: float) -> dict:
+        return {"chunk_id": self.chunk_ids[i], "text": self.texts[i], "source": self.sources[i], "score": score}
+
+    def vector_search(self, query: str, k: int = 3) -> List[dict]:
+        """
+        Returns the k chunks most similar to the query (cosine similarity).
+
+        Exact for small indexes; above VECTOR_EXACT_LIMIT chunks only the
+        VECTOR_NPROBE clusters nearest to the query are scanned.
+
+        Returns:
+            List of {"chunk_id", "text", "source", "score"} dicts, best first
+        """
+        return [self._hit(i, score) for score, i in self._vector_ranking(query, k)]
+
+    def _vector_ranking(self, query: str, k: int) -> List[Tuple[float, int]]:
+        if not self.chunk_ids:
+            return []
+
+        query_vector = embed_query(query)
+        if np is not None:
+            if len(query_vector) != self._matrix.shape[1]:
+                raise ValueError("Query embedding dimension does not match the index")
+            query_np = np.frombuffer(query_vector.tobytes(), dtype=np.float32)
+            if self._clusters is not None:
+                nprobe = min(VECTOR_NPROBE, len(self._clusters))
+                nearest = np.argpartition(-(self._centroids @ query_np), nprobe - 1)[:nprobe]
+                candidates = np.concatenate([self._clusters[c] for c in nearest])
+            else:
+                candidates = np.arange(len(self._matrix))
+            scores = self._matrix[candidates] @ query_np
+            k = min(k, len(scores))
+            if k == 0:
+                return []
+            top = np.argpartition(-scores, k - 1)[:k]
+            ranked = sorted(((float(scores[i]), int(candidates[i])) for i in top), reverse=True)
+        else:
+            scored = ((sum(a * b for a, b in zip(vector, query_vector)), i) for i, vector in enumerate(self._vectors))
+            ranked = heapq.nlargest(k, scored)
+        return ranked
+
+
+# ============================================================================
+# SHARED INDEX
+# ============================================================================
+
+_index: Optional[KnowledgeIndex] = None
+_index_version = None
+_checked_at = 0.0
+_index_lock = threading.Lock()
+
+
+def knowledge_version() -> tuple:
+    """
+    Cheap fingerprint of the stored knowledge base: chunk count, highest chunk
+    id and latest document ingestion time. Changes whenever an ingestion run
+    (in any worker) adds, removes or reorders chunks.
+    """
+    db = SessionLocal()
+    try:
+        count, max_id = db.query(func.count(KnowledgeChunk.id), func.max(KnowledgeChunk.id)).one()
+        return count, max_id, db.query(func.max(KnowledgeDocument.ingested_at)).scalar()
+    finally:
+        db.close()
+
+
+def get_knowledge_index() -> KnowledgeIndex:
+    """
+    Returns the shared index, loading it from the database on first use.
+
+    At most every KNOWLEDGE_INDEX_CHECK_SECONDS the stored version is
+    compared with the loaded one and the index is rebuilt if it changed, so
+    workers that did not run an ingestion pick it up too. Other requests
+    keep using the current index while one request rebuilds it.
+    """
+    global _checked_at
+    if _index is not None and time.monotonic() - _checked_at < KNOWLEDGE_INDEX_CHECK_SECONDS:
+        return _index
+    if not _index_lock.acquire(blocking=_index is None):
+        return _index
+    try:
+        if _index is None or time.monotonic() - _checked_at >= KNOWLEDGE_INDEX_CHECK_SECONDS:
+            version = knowledge_version()
+            if _index is None or version != _index_version:
+                _load(version)
+            _checked_at = time.monotonic()
+    finally:
+        _index_lock.release()
+    return _index
+
+
+def _load(version: tuple):
+    global _index, _index_version
+    reloading = _index is not None
+    _index = KnowledgeIndex.load()
+    _index_version = version
+    logger.info(f"✓ Knowledge index {'reloaded' if reloading else 'loaded'} ({len(_index)} chunks)")
+
+
+def reload_knowledge_index() -> int:
+    """
+    Rebuilds the shared index from the database (e.g. after ingestion).
+
+    Returns:
+        Number of chunks in the new index
+    """
+    global _checked_at
+    with _index_lock:
+        _load(knowledge_version())
+        _checked_at = time.monotonic()
+    return len(_index)
+
+
+def search_knowledge(query: str, k: int = 3) -> List[dict]:
+    """Searches the knowledge base (BM25 + vectors, RRF-fused) for the chunks most relevant to query."""
+    with span("retrieval", index="hybrid"):
+        return get_knowledge_index().hybrid_search(query, k=k)
+
+
+def is_relevant(hit: dict) -> bool:
+    """
+    True when a hybrid hit is evidence for the query rather than just the
+    least-bad chunk: it contains a rare query term, matches query terms with
+    enough idf weight (MIN_LEXICAL_SCORE), or is semantically close
+    (MIN_SIMILARITY).
+    """
+    return (
+        hit.get("exact", False)
+        or hit.get("bm25", 0.0) >= MIN_LEXICAL_SCORE
+        or (hit.get("similarity") or 0.0) >= MIN_SIMILARITY
+    )
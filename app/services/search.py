@@ -0,0 +1,312 @@
+"""Search Service: Full-Text Search over Alerts and Reports (SQLite FTS5 / Postgres tsvector)"""
+
+import html
+import logging
+import re
+from typing import List, Optional
+
+from sqlalchemy import bindparam, event, inspect, text
+
+from app.models.database import ComplianceAlert, engine
+
+logger = logging.getLogger(__name__)
+
+# External-content FTS5 tables mirror these columns; triggers keep them in sync.
+# Alerts index analysis_text (the JSON values) rather than the serialized
+# impact_json, so JSON keys and punctuation are not searchable.
+_SQLITE_FTS_TABLES = {
+    "compliance_alerts": ("summary", "analysis_text"),
+    "generated_reports": ("title", "content_markdown"),
+}
+
+_POSTGRES_VECTORS = {
+    "compliance_alerts": "coalesce(summary, '') || ' ' || coalesce(analysis_text, '')",
+    "generated_reports": "coalesce(title, '') || ' ' || coalesce(content_markdown, '')",
+}
+
+# impact_json fields that are not searchable text: summary is indexed from its
+# own column; impact is a facet; the rest are flags/metadata
+_ANALYSIS_TEXT_SKIP = {"summary", "impact", "action_required", "source"}
+
+SNIPPET_TOKENS = 16
+
+# Match delimiters used inside the database; stored text is HTML-escaped
+# before they are turned into <mark> tags (see highlight())
+_MARK_START, _MARK_STOP = "\x02", "\x03"
+_HEADLINE_OPTIONS = f"StartSel={_MARK_START}, StopSel={_MARK_STOP}, MaxWords=30, MinWords=10"
+_MARK_PARAMS = {"mark_start": _MARK_START, "mark_stop": _MARK_STOP, "headline_options": _HEADLINE_OPTIONS}
+
+
+def is_postgres() -> bool:
+    return engine.dialect.name == "postgresql"
+
+
+# ============================================================================
+# ANALYSIS TEXT
+# ============================================================================
+
+def analysis_text(impact_json) -> str:
+    """Joins the string values of an alert's analysis (actions, rationale, ...) into searchable text."""
+    values = []
+
+    def collect(value):
+        if isinstance(value, str):
+            values.append(value)
+        elif isinstance(value, dict):
+            for nested in value.values():
+                collect(nested)
+        elif isinstance(value, (list, tuple)):
+            for nested in value:
+                collect(nested)
+
+    for key, value in (impact_json or {}).items():
+        if key not in _ANALYSIS_TEXT_SKIP:
+            collect(value)
+    return "\n".join(values)
+
+
+@event.listens_for(ComplianceAlert, "before_insert")
+@event.listens_for(ComplianceAlert, "before_update")
+def _set_analysis_text(mapper, connection, target):
+    target.analysis_text = analysis_text(target.impact_json)
+
+
+# ============================================================================
+# INDEX SETUP
+# ============================================================================
+
+def init_search_index():
+    """
+    Creates the full-text index and the triggers that keep it current.
+
+    SQLite: external-content FTS5 tables with insert/update/delete triggers
+    (rebuilt once from existing rows when first created).
+    Postgres: generated tsvector columns with GIN indexes.
+    Safe to call on every startup.
+    """
+    with engine.begin() as conn:
+        _backfill_analysis_text(conn)
+        if is_postgres():
+            for table, document in _POSTGRES_VECTORS.items():
+                # Recreate vectors generated from an older document expression
+                current = conn.execute(text(
+                    "SELECT generation_expression FROM information_schema.columns "
+                    "WHERE table_name = :table AND column_name = 'search_vector'"
+                ), {"table": table}).scalar()
+                if current is not None and "impact_json" in current:
+                    conn.execute(text(f"ALTER TABLE {table} DROP COLUMN search_vector"))
+                conn.execute(text(
+                    f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+                    f"GENERATED ALWAYS AS (to_tsvector('english', {document})) STORED"
+                ))
+                conn.execute(text(
+                    f"CREATE INDEX IF NOT EXISTS ix_{table}_search_vector ON {table} USING GIN (search_vector)"
+                ))
+        elif engine.dialect.name == "sqlite":
+            for table, columns in _SQLITE_FTS_TABLES.items():
+                _create_sqlite_fts(conn, table, columns)
+        else:
+            logger.warning(f"⚠ Full-text search not supported on {engine.dialect.name}")
+            return
+    logger.info("✓ Full-text search index ready")
+
+
+def _backfill_analysis_text(conn):
+    """Adds compliance_alerts.analysis_text to older databases and fills it in."""
+    if "analysis_text" not in {column["name"] for column in inspect(conn).get_columns("compliance_alerts")}:
+        conn.execute(text("ALTER TABLE compliance_alerts ADD COLUMN analysis_text TEXT"))
+    table = ComplianceAlert.__table__
+    rows = conn.execute(
+        table.select().with_only_columns(table.c.id, table.c.impact_json).where(table.c.analysis_text.is_(None))
+    ).all()
+    if rows:
+        conn.execute(
+            table.update().where(table.c.id == bindparam("alert_id")).values(analysis_text=bindparam("text")),
+            [{"alert_id": row.id, "text": analysis_text(row.impact_json)} for row in rows],
+        )
+        logger.info(f"✓ Backfilled analysis_text for {len(rows)} alerts")
+
+
+def _create_sqlite_fts(conn, table: str, columns: tuple):
+    fts = f"{table}_fts"
+    column_list = ", ".join(columns)
+    new_values = ", ".join(f"new.{column}" for column in columns)
+    old_values = ", ".join(f"old.{column}" for column in columns)
+    create = (
+        f"CREATE VIRTUAL TABLE {fts} USING fts5("
+        f"{column_list}, content='{table}', content_rowid='id', tokenize='unicode61')"
+    )
+
+    existing = conn.execute(
+        text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": fts}
+    ).scalar()
+    if existing is not None and existing != create:
+        # Indexed columns changed: drop the index and its triggers, then rebuild
+        for trigger in ("ai", "ad", "au"):
+            conn.execute(text(f"DROP TRIGGER IF EXISTS {fts}_{trigger}"))
+        conn.execute(text(f"DROP TABLE {fts}"))
+        existing = None
+    existed = existing is not None
+
+    conn.execute(text(create.replace("CREATE VIRTUAL TABLE", "CREATE VIRTUAL TABLE IF NOT EXISTS", 1)))
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {column_list}) VALUES (new.id, {new_values}); END"
+    ))
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.id, {old_values}); END"
+    ))
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {column_list} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {column_list}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {column_list}) VALUES (new.id, {new_values}); END"
+    ))
+    if not existed:
+        conn.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+        logger.info(f"✓ Built full-text index {fts} from existing rows")
+
+
+# ============================================================================
+# QUERIES
+# ============================================================================
+
+def to_fts5_query(query: str) -> Optional[str]:
+    """
+    Turns free text into a safe FTS5 query.
+
+    Each whitespace-separated word becomes a quoted phrase, so FTS5 syntax
+    characters are treated literally and "500,000" matches as "500 000".
+    All words must match.
+    """
+    words = [word.replace('"', '""') for word in query.split() if re.search(r"\w", word)]
+    return " ".join(f'"{word}"' for word in words) or None
+
+
+def highlight(snippet: Optional[str]) -> Optional[str]:
+    """HTML-escapes a snippet and wraps its matches in <mark> tags."""
+    if snippet is None:
+        return None
+    return html.escape(snippet).replace(_MARK_START, "<mark>").replace(_MARK_STOP, "</mark>")
+
+
+def search_alerts(conn, query: str, impact: Optional[str], limit: int) -> List[dict]:
+    """Ranked alert matches with highlighted snippets (best first)."""
+    if is_postgres():
+        sql = """
+            SELECT a.id, a.summary AS title, a.impact_json->>'impact' AS impact, a.action_required,
+                   a.created_at, ts_headline('english', a.summary || ' ' || coalesce(a.analysis_text, ''), q, :headline_options) AS snippet,
+                   ts_rank(a.search_vector, q) AS score
+            FROM compliance_alerts a, websearch_to_tsquery('english', :query) q
+            WHERE a.search_vector @@ q AND (:impact IS NULL OR a.impact_json->>'impact' = :impact)
+            ORDER BY score DESC LIMIT :limit
+        """
+        params = {"query": query, "impact": impact, "limit": limit}
+    else:
+        sql = f"""
+            SELECT a.id, a.summary AS title, json_extract(a.impact_json, '$.impact') AS impact,
+                   a.action_required, a.created_at,
+                   snippet(compliance_alerts_fts, -1, :mark_start, :mark_stop, '…', {SNIPPET_TOKENS}) AS snippet,
+                   -bm25(compliance_alerts_fts) AS score
+            FROM compliance_alerts_fts JOIN compliance_alerts a ON a.id = compliance_alerts_fts.rowid
+            WHERE compliance_alerts_fts MATCH :query
+              AND (:impact IS NULL OR json_extract(a.impact_json, '$.impact') = :impact)
+            ORDER BY bm25(compliance_alerts_fts) LIMIT :limit
+        """
+        params = {"query": to_fts5_query(query), "impact": impact, "limit": limit}
+
+    return [
+        {
+            "type": "alert",
+            "id": row.id,
+            "title": row.title,
+            "snippet": highlight(row.snippet),
+            "score": round(float(row.score), 6),
+            "impact": row.impact,
+            "status": "open" if row.action_required else "actioned",
+            "created_at": row.created_at,
+        }
+        for row in conn.execute(text(sql), {**params, **_MARK_PARAMS})
+    ]
+
+
+def search_reports(conn, query: str, status: Optional[str], limit: int) -> List[dict]:
+    """Ranked report matches with highlighted snippets (best first)."""
+    if is_postgres():
+        sql = """
+            SELECT r.id, r.title, r.status, r.created_at,
+                   ts_headline('english', r.content_markdown, q, :headline_options) AS snippet,
+                   ts_rank(r.search_vector, q) AS score
+            FROM generated_reports r, websearch_to_tsquery('english', :query) q
+            WHERE r.search_vector @@ q AND (:status IS NULL OR r.status = :status)
+            ORDER BY score DESC LIMIT :limit
+        """
+        params = {"query": query, "status": status, "limit": limit}
+    else:
+        sql = f"""
+            SELECT r.id, r.title, r.status, r.created_at,
+                   snippet(generated_reports_fts, -1, :mark_start, :mark_stop, '…', {SNIPPET_TOKENS}) AS snippet,
+                   -bm25(generated_reports_fts) AS score
+            FROM generated_reports_fts JOIN generated_reports r ON r.id = generated_reports_fts.rowid
+            WHERE generated_reports_fts MATCH :query AND (:status IS NULL OR r.status = :status)
+            ORDER BY bm25(generated_reports_fts) LIMIT :limit
+        """
+        params = {"query": to_fts5_query(query), "status": status, "limit": limit}
+
+    return [
+        {
+            "type": "report",
+            "id": row.id,
+            "title": row.title,
+            "snippet": highlight(row.snippet),
+            "score": round(float(row.score), 6),
+            "impact": None,
+            "status": row.status,
+            "created_at": row.created_at,
+        }
+        for row in conn.execute(text(sql), {**params, **_MARK_PARAMS})
+    ]
+
+
+def alert_facets(conn, query: str) -> dict:
+    """Counts of matching alerts by impact level and open/actioned status."""
+    if is_postgres():
+        sql = """
+            SELECT a.impact_json->>'impact' AS impact, a.action_required, count(*) AS n
+            FROM compliance_alerts a WHERE a.search_vector @@ websearch_to_tsquery('english', :query)
+            GROUP BY 1, 2
+        """
+        params = {"query": query}
+    else:
+        sql = """
+            SELECT json_extract(a.impact_json, '$.impact') AS impact, a.action_required, count(*) AS n
+            FROM compliance_alerts_fts JOIN compliance_alerts a ON a.id = compliance_alerts_fts.rowid
+            WHERE compliance_alerts_fts MATCH :query GROUP BY 1, 2
+        """
+        params = {"query": to_fts5_query(query)}
+
+    impact, status = {}, {}
+    for row in conn.execute(text(sql), params):
+        impact_key = row.impact or "Unknown"
+        status_key = "open" if row.action_required else "actioned"
+        impact[impact_key] = impact.get(impact_key, 0) + row.n
+        status[status_key] = status.get(status_key, 0) + row.n
+    return {"impact": impact, "status": status}
+
+
+def report_facets(conn, query: str) -> dict:
+    """Counts of matching reports by status."""
+    if is_postgres():
+        sql = """
+            SELECT r.status, count(*) AS n FROM generated_reports r
+            WHERE r.search_vector @@ websearch_to_tsquery('english', :query) GROUP BY 1
+        """
+        params = {"query": query}
+    else:
+        sql = """
+            SELECT r.status, count(*) AS n
+            FROM generated_reports_fts JOIN generated_reports r ON r.id = generated_reports_fts.rowid
+            WHERE generated_reports_fts MATCH :query GROUP BY 1
+        """
+        params = {"query": to_fts5_query(query)}
+    return {"status": {row.status or "unknown": row.n for row in conn.execute(text(sql), params)}}
@@ -0,0 +1,221 @@
+"""Security Service: Password Hashing, JWT Issuance & Verification"""
+
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import os
+import time
+from typing import Optional
+
+from fastapi import Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from starlette.concurrency import run_in_threadpool
+
+from app.config import ADMIN_EMAILS, JWT_SECRET_KEY, JWT_ALGORITHM, JWT_EXPIRE_MINUTES, PASSWORD_HASH_ITERATIONS
+from app.models.database import SessionLocal, User
+from app.models.schemas import UserResponse
+from app.services.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# token -> verified claims (expiry is re-checked on every hit)
+_token_cache = LRUCache(maxsize=10000)
+
+# user id -> UserResponse, refreshed periodically in case the account is removed
+_user_cache = LRUCache(maxsize=10000, ttl=300)
+
+_bearer_scheme = HTTPBearer(auto_error=False)
+
+# built on first use so importing this module stays cheap
+_dummy_hash: Optional[str] = None
+
+
+class AuthError(Exception):
+    """Raised when a token cannot be verified."""
+
+
+# ============================================================================
+# PASSWORD HASHING
+# ============================================================================
+
+def hash_password(password: str) -> str:
+    """
+    Hashes a password with PBKDF2-HMAC-SHA256 and a random salt.
+
+    Returns:
+        Encoded hash: "pbkdf2_sha256$<iterations>$<salt_hex>$<hash_hex>"
+    """
+    salt = os.urandom(16)
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, PASSWORD_HASH_ITERATIONS)
+    return f"pbkdf2_sha256${PASSWORD_HASH_ITERATIONS}${salt.hex()}${digest.hex()}"
+
+
+def _dummy_password_hash() -> str:
+    """Random hash checked for unknown emails so they cost as much as a real account."""
+    global _dummy_hash
+    if _dummy_hash is None:
+        _dummy_hash = hash_password(os.urandom(16).hex())
+    return _dummy_hash
+
+
+def verify_password(password: str, password_hash: Optional[str]) -> bool:
+    """
+    Checks a password against a hash produced by hash_password().
+
+    A missing hash still runs PBKDF2 against a dummy hash (and fails), so
+    unknown emails can't be told apart from wrong passwords by timing.
+    """
+    if password_hash is None:
+        verify_password(password, _dummy_password_hash())
+        return False
+    try:
+        scheme, iterations, salt_hex, digest_hex = (password_hash or "").split("$")
+    except ValueError:
+        return False
+    if scheme != "pbkdf2_sha256":
+        return False
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode(), bytes.fromhex(salt_hex), int(iterations))
+    return hmac.compare_digest(digest.hex(), digest_hex)
+
+
+async def hash_password_async(password: str) -> str:
+    """hash_password() run in the thread pool so it never blocks the event loop."""
+    return await run_in_threadpool(hash_password, password)
+
+
+async def verify_password_async(password: str, password_hash: Optional[str]) -> bool:
+    """verify_password() run in the thread pool so it never blocks the event loop."""
+    return await run_in_threadpool(verify_password, password, password_hash)
+
+
+# ============================================================================
+# JWT (HS256)
+# ============================================================================
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _sign(signing_input: bytes) -> str:
+    return _b64encode(hmac.new(JWT_SECRET_KEY.encode(), signing_input, hashlib.sha256).digest())
+
+
+def create_access_token(user_id: int, email: str) -> str:
+    """
+    Issues a signed JWT for a user.
+
+    Args:
+        user_id: ID of the authenticated User (stored as the "sub" claim)
+        email: User email (stored as the "email" claim)
+
+    Returns:
+        Compact JWS string
+    """
+    now = int(time.time())
+    header = {"alg": JWT_ALGORITHM, "typ": "JWT"}
+    claims = {"sub": str(user_id), "email": email, "iat": now, "exp": now + JWT_EXPIRE_MINUTES * 60}
+    signing_input = (
+        _b64encode(json.dumps(header, separators=(",", ":")).encode())
+        + "."
+        + _b64encode(json.dumps(claims, separators=(",", ":")).encode())
+    )
+    return f"{signing_input}.{_sign(signing_input.encode())}"
+
+
+def decode_access_token(token: str) -> dict:
+    """
+    Verifies a JWT's signature and expiry and returns its claims.
+
+    Verified claims are cached per token, so repeat requests with the same
+    token only pay for a cache lookup and an expiry comparison.
+
+    Raises:
+        AuthError: If the token is malformed, tampered with or expired
+    """
+    claims = _token_cache.get(token)
+    if claims is None:
+        try:
+            header_b64, payload_b64, signature = token.split(".")
+            header = json.loads(_b64decode(header_b64))
+            if header.get("alg") != JWT_ALGORITHM:
+                raise AuthError("Unsupported token algorithm")
+            expected = _sign(f"{header_b64}.{payload_b64}".encode())
+            if not hmac.compare_digest(signature, expected):
+                raise AuthError("Invalid token signature")
+            claims = json.loads(_b64decode(payload_b64))
+        except AuthError:
+            raise
+        except Exception:
+            raise AuthError("Malformed token")
+        _token_cache.set(token, claims)
+
+    if claims.get("exp", 0) <= time.time():
+        _token_cache.invalidate(token)
+        raise AuthError("Token expired")
+    return claims
+
+
+# ============================================================================
+# FASTAPI DEPENDENCY
+# ============================================================================
+
+def _load_user(user_id: int) -> Optional[UserResponse]:
+    db = SessionLocal()
+    try:
+        user = db.query(User.id, User.email).filter(User.id == user_id).first()
+        return UserResponse(id=user.id, email=user.email) if user else None
+    finally:
+        db.close()
+
+
+async def get_current_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(_bearer_scheme),
+) -> UserResponse:
+    """
+    FastAPI dependency that authenticates the request's bearer token.
+
+    Returns:
+        The authenticated user
+
+    Raises:
+        HTTPException 401: Missing, invalid or expired token, or unknown user
+    """
+    if credentials is None or credentials.scheme.lower() != "bearer":
+        raise HTTPException(
+            status_code=401,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    try:
+        claims = decode_access_token(credentials.credentials)
+    except AuthError as e:
+        raise HTTPException(status_code=401, detail=str(e), headers={"WWW-Authenticate": "Bearer"})
+
+    user_id = int(claims["sub"])
+    user = _user_cache.get(user_id)
+    if user is None:
+        user = await run_in_threadpool(_load_user, user_id)
+        if user is None:
+            raise HTTPException(status_code=401, detail="User not found", headers={"WWW-Authenticate": "Bearer"})
+        _user_cache.set(user_id, user)
+    return user
+
+
+async def require_admin(current_user: UserResponse = Depends(get_current_user)) -> UserResponse:
+    """
+    FastAPI dependency that only admits accounts listed in ADMIN_EMAILS.
+
+    Raises:
+        HTTPException 401: Not authenticated (see get_current_user)
+        HTTPException 403: Authenticated, but not an admin
+    """
+    if current_user.email.lower() not in ADMIN_EMAILS:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return current_user
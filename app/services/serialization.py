@@ -0,0 +1,59 @@
+"""
+Serialization Service: Fast JSON Encoding for Large Responses
+
+List endpoints read column tuples (no ORM objects) and turn them straight
+into dicts shaped like their response model, skipping Pydantic validation
+and FastAPI's jsonable_encoder pass. Those dicts are encoded with orjson
+when it is installed, falling back to the stdlib json module.
+
+See benchmarks/serialization.py for the per-row cost of each path.
+"""
+
+import json
+from datetime import date, datetime
+from typing import Any, List, Type
+
+from fastapi import Response
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # stdlib fallback
+    orjson = None
+
+
+def _default(value: Any):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Encodes content as compact JSON bytes (datetimes as ISO 8601)."""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class FastJSONResponse(Response):
+    """JSON response encoded with orjson (or compact stdlib json)."""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def model_columns(model: Type[BaseModel], orm_class) -> List:
+    """ORM columns matching a response model's fields, in field order."""
+    return [getattr(orm_class, field) for field in model.model_fields]
+
+
+def rows_to_dicts(model: Type[BaseModel], rows) -> List[dict]:
+    """
+    Turns column-tuple rows (selected with model_columns) into response dicts.
+
+    Rows come straight from the database with the model's field types, so
+    they are not re-validated.
+    """
+    fields = tuple(model.model_fields)
+    return [dict(zip(fields, row)) for row in rows]
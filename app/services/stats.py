@@ -0,0 +1,286 @@
+"""
+Stats Service: Incrementally Maintained Dashboard Aggregates
+
+Alert and report counts are kept in small bucket tables (one row per
+hour/day, impact level and open/actioned state for alerts; per hour/day and
+status for reports). Mapper events adjust the buckets inside the same flush
+that inserts an alert or changes a report's status, so the dashboard reads a
+few hundred bucket rows instead of scanning the alert and report tables.
+
+Buckets are keyed by creation time and are not decremented when rows are
+removed, so trends keep counting alerts/reports that were later archived.
+"""
+
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, func, inspect, insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.config import STATS_CACHE_TTL
+from app.models.database import (
+    SessionLocal,
+    ComplianceAlert,
+    GeneratedReport,
+    AlertStatsBucket,
+    ReportStatsBucket,
+)
+from app.services.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+GRANULARITIES = ("hour", "day")
+
+_alert_buckets = AlertStatsBucket.__table__
+_report_buckets = ReportStatsBucket.__table__
+
+_stats_cache = LRUCache(maxsize=64, ttl=STATS_CACHE_TTL)
+
+
+def bucket_start(timestamp: datetime, granularity: str) -> datetime:
+    """Truncates a timestamp to the start of its hour or day."""
+    if granularity == "hour":
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _alert_impact(impact_json) -> str:
+    return (impact_json or {}).get("impact") or "Unknown"
+
+
+# ============================================================================
+# INCREMENTAL MAINTENANCE
+# ============================================================================
+
+_UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+def _bump(connection, table, keys: dict, delta: int):
+    """
+    Adds delta to the bucket identified by keys, creating it if needed.
+
+    Runs inside the caller's flush, so on SQLite/Postgres this is a single
+    atomic upsert; concurrent writers creating the same bucket must not fail
+    the alert/report insert on the unique constraint.
+    """
+    dialect_insert = _UPSERT_INSERTS.get(connection.dialect.name)
+    if dialect_insert is not None:
+        statement = dialect_insert(table).values(**keys, count=delta)
+        connection.execute(statement.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={"count": table.c.count + statement.excluded.count},
+        ))
+        return
+
+    conditions = [table.c[column] == value for column, value in keys.items()]
+    result = connection.execute(update(table).where(*conditions).values(count=table.c.count + delta))
+    if result.rowcount == 0:
+        connection.execute(insert(table).values(**keys, count=delta))
+
+
+def _bump_alert(connection, created_at: datetime, impact: str, action_required: bool, delta: int):
+    for granularity in GRANULARITIES:
+        _bump(connection, _alert_buckets, {
+            "granularity": granularity,
+            "bucket_start": bucket_start(created_at, granularity),
+            "impact": impact,
+            "action_required": bool(action_required),
+        }, delta)
+
+
+def _bump_report(connection, created_at: datetime, status: str, delta: int):
+    for granularity in GRANULARITIES:
+        _bump(connection, _report_buckets, {
+            "granularity": granularity,
+            "bucket_start": bucket_start(created_at, granularity),
+            "status": status or "unknown",
+        }, delta)
+
+
+def _previous(target, attribute: str):
+    """Value of attribute before the current flush, or None if it did not change."""
+    history = inspect(target).attrs[attribute].history
+    return history.deleted[0] if history.deleted else None
+
+
+# active_history makes SQLAlchemy load the previous value even when the
+# attribute was expired (e.g. after a commit), so updates can move a row
+# out of its old bucket
+@event.listens_for(ComplianceAlert.action_required, "set", active_history=True)
+@event.listens_for(ComplianceAlert.impact_json, "set", active_history=True)
+@event.listens_for(GeneratedReport.status, "set", active_history=True)
+def _load_previous_value(target, value, oldvalue, initiator):
+    pass
+
+
+@event.listens_for(ComplianceAlert, "after_insert")
+def _on_alert_insert(mapper, connection, target):
+    _bump_alert(
+        connection,
+        target.created_at or datetime.utcnow(),
+        _alert_impact(target.impact_json),
+        target.action_required,
+        +1,
+    )
+
+
+@event.listens_for(ComplianceAlert, "after_update")
+def _on_alert_update(mapper, connection, target):
+    state = inspect(target).attrs
+    if not (state.action_required.history.has_changes() or state.impact_json.history.has_changes()):
+        return
+    previous_action = _previous(target, "action_required")
+    previous_impact = _previous(target, "impact_json")
+    created_at = target.created_at or datetime.utcnow()
+    _bump_alert(
+        connection,
+        created_at,
+        _alert_impact(previous_impact if previous_impact is not None else target.impact_json),
+        previous_action if previous_action is not None else target.action_required,
+        -1,
+    )
+    _bump_alert(connection, created_at, _alert_impact(target.impact_json), target.action_required, +1)
+
+
+@event.listens_for(GeneratedReport, "after_insert")
+def _on_report_insert(mapper, connection, target):
+    _bump_report(connection, target.created_at or datetime.utcnow(), target.status, +1)
+
+
+@event.listens_for(GeneratedReport, "after_update")
+def _on_report_update(mapper, connection, target):
+    previous_status = _previous(target, "status")
+    if previous_status is None or previous_status == target.status:
+        return
+    created_at = target.created_at or datetime.utcnow()
+    _bump_report(connection, created_at, previous_status, -1)
+    _bump_report(connection, created_at, target.status, +1)
+
+
+def init_stats():
+    """
+    Backfills the aggregate tables from existing alerts and reports.
+
+    Only runs when the bucket tables are empty (first start after upgrading),
+    streaming the source rows once; afterwards the mapper events keep them
+    current. Safe to call on every startup.
+    """
+    db = SessionLocal()
+    try:
+        if db.query(AlertStatsBucket.id).first() or db.query(ReportStatsBucket.id).first():
+            return
+
+        alert_counts = {}
+        for created_at, impact_json, action_required in (
+            db.query(ComplianceAlert.created_at, ComplianceAlert.impact_json, ComplianceAlert.action_required)
+            .yield_per(1000)
+        ):
+            for granularity in GRANULARITIES:
+                key = (granularity, bucket_start(created_at, granularity), _alert_impact(impact_json), bool(action_required))
+                alert_counts[key] = alert_counts.get(key, 0) + 1
+
+        report_counts = {}
+        for created_at, status in db.query(GeneratedReport.created_at, GeneratedReport.status).yield_per(1000):
+            for granularity in GRANULARITIES:
+                key = (granularity, bucket_start(created_at, granularity), status or "unknown")
+                report_counts[key] = report_counts.get(key, 0) + 1
+
+        db.bulk_insert_mappings(AlertStatsBucket, [
+            {"granularity": g, "bucket_start": b, "impact": i, "action_required": a, "count": n}
+            for (g, b, i, a), n in alert_counts.items()
+        ])
+        db.bulk_insert_mappings(ReportStatsBucket, [
+            {"granularity": g, "bucket_start": b, "status": s, "count": n}
+            for (g, b, s), n in report_counts.items()
+        ])
+        db.commit()
+        if alert_counts or report_counts:
+            logger.info(f"✓ Stats backfilled ({len(alert_counts)} alert buckets, {len(report_counts)} report buckets)")
+    finally:
+        db.close()
+
+
+# ============================================================================
+# QUERIES
+# ============================================================================
+
+def get_stats(granularity: str = "day", days: int = 30) -> dict:
+    """
+    Dashboard statistics: overall alert/report breakdowns plus a trend series.
+
+    Served from a short-TTL in-memory cache (STATS_CACHE_TTL seconds), so
+    bursts of dashboard refreshes cost one read of the bucket tables.
+
+    Args:
+        granularity: Trend bucket size, "hour" or "day"
+        days: How many days of trend to return
+
+    Returns:
+        Dict with "alerts", "reports" and "trend" sections
+    """
+    return _stats_cache.get_or_set((granularity, days), lambda: _compute_stats(granularity, days, datetime.utcnow()))
+
+
+def _compute_stats(granularity: str, days: int, now: datetime) -> dict:
+    since = bucket_start(now - timedelta(days=days), granularity)
+    db = SessionLocal()
+    try:
+        # Totals come from the day buckets (one row per day/impact/state)
+        by_impact, by_state = {}, {"open": 0, "actioned": 0}
+        for impact, action_required, count in (
+            db.query(AlertStatsBucket.impact, AlertStatsBucket.action_required, func.sum(AlertStatsBucket.count))
+            .filter(AlertStatsBucket.granularity == "day")
+            .group_by(AlertStatsBucket.impact, AlertStatsBucket.action_required)
+        ):
+            by_impact[impact] = by_impact.get(impact, 0) + count
+            by_state["open" if action_required else "actioned"] += count
+
+        by_status = {
+            status: count
+            for status, count in (
+                db.query(ReportStatsBucket.status, func.sum(ReportStatsBucket.count))
+                .filter(ReportStatsBucket.granularity == "day")
+                .group_by(ReportStatsBucket.status)
+            )
+            if count
+        }
+
+        trend = {}
+        for start, impact, count in (
+            db.query(AlertStatsBucket.bucket_start, AlertStatsBucket.impact, func.sum(AlertStatsBucket.count))
+            .filter(AlertStatsBucket.granularity == granularity, AlertStatsBucket.bucket_start >= since)
+            .group_by(AlertStatsBucket.bucket_start, AlertStatsBucket.impact)
+        ):
+            point = trend.setdefault(start, {"alerts": 0, "alerts_by_impact": {}, "reports": 0})
+            point["alerts"] += count
+            point["alerts_by_impact"][impact] = count
+        for start, count in (
+            db.query(ReportStatsBucket.bucket_start, func.sum(ReportStatsBucket.count))
+            .filter(ReportStatsBucket.granularity == granularity, ReportStatsBucket.bucket_start >= since)
+            .group_by(ReportStatsBucket.bucket_start)
+        ):
+            trend.setdefault(start, {"alerts": 0, "alerts_by_impact": {}, "reports": 0})["reports"] += count
+    finally:
+        db.close()
+
+    return {
+        "alerts": {
+            "total": sum(by_impact.values()),
+            "by_impact": {impact: count for impact, count in by_impact.items() if count},
+            "open": by_state["open"],
+            "actioned": by_state["actioned"],
+        },
+        "reports": {"total": sum(by_status.values()), "by_status": by_status},
+        "granularity": granularity,
+        "trend": [
+            {"bucket_start": start, **point}
+            for start, point in sorted(trend.items())
+            if point["alerts"] or point["reports"]
+        ],
+        "generated_at": now,
+    }
+
+
+def clear_stats_cache():
+    """Drops cached /stats responses (e.g. after archiving or a manual backfill)."""
+    _stats_cache.clear()
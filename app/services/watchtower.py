@@ -3,14 +3,14 @@
 import logging
 import json
 from datetime import datetime
-from apscheduler.schedulers.background import BackgroundScheduler
 from app.models.database import SessionLocal, ComplianceAlert
-from app.config import GEMINI_API_KEY, llm
+from app.config import GEMINI_API_KEY, RETENTION_INTERVAL_HOURS, get_llm
+from app.services.llm import invoke_llm
 
 logger = logging.getLogger(__name__)
 
-# Global scheduler instance
-scheduler = BackgroundScheduler()
+# Global scheduler instance (created on start to keep imports light)
+scheduler = None
 last_scraped_content = None
 
 
@@ -38,7 +38,7 @@ def run_watchtower_check():
         last_scraped_content = new_content
         
         # Analyze the change
-        if GEMINI_API_KEY and llm:
+        if GEMINI_API_KEY and get_llm():
             # Real API call
             try:
                 analysis_prompt = f"""Analyze this compliance update and provide:
@@ -50,7 +50,7 @@ def run_watchtower_check():
                 
                 Return as JSON."""
                 
-                response = llm.invoke(analysis_prompt)
+                response = invoke_llm(analysis_prompt, tenant="system", call="watchtower")
                 analysis_text = response.content
                 
                 # Parse JSON from response
@@ -120,16 +120,26 @@ def start_watchtower_scheduler():
     """
     Starts the APScheduler background scheduler for Watchtower.
     
-    Runs the change detection check every 2 minutes.
+    Runs the change detection check every 2 minutes and data retention
+    (archival + compaction) every RETENTION_INTERVAL_HOURS.
     """
+    global scheduler
+    
+    if scheduler is None:
+        from apscheduler.schedulers.background import BackgroundScheduler
+        scheduler = BackgroundScheduler()
+    
     if not scheduler.running:
+        from app.services.retention import run_retention
         scheduler.add_job(run_watchtower_check, "interval", minutes=2, id="watchtower")
+        scheduler.add_job(run_retention, "interval", hours=RETENTION_INTERVAL_HOURS, id="retention")
         scheduler.start()
         logger.info("✓ Watchtower scheduler started (runs every 2 minutes)")
+        logger.info(f"✓ Retention scheduled every {RETENTION_INTERVAL_HOURS:g} hours")
 
 
 def stop_watchtower_scheduler():
     """Stops the APScheduler background scheduler."""
-    if scheduler.running:
+    if scheduler is not None and scheduler.running:
         scheduler.shutdown()
         logger.info("🛑 Watchtower scheduler stopped")
@@ -0,0 +1,116 @@
+"""
+Retrieval Benchmark: BM25, Vector and Hybrid (RRF) Query Latency
+
+Builds an in-memory KnowledgeIndex from a synthetic compliance-like corpus
+(no database needed) and reports per-query latency for each retrieval mode.
+Word frequencies follow a Zipf-like distribution, so posting-list lengths
+(which dominate BM25 cost) resemble those of real text.
+
+Before timing, hybrid search is checked to return only chunks containing
+the exact term for circular-number / code / amount queries (exits 1 if not).
+
+Usage:
+    python benchmarks/retrieval.py [--chunks 100000] [--queries 200]
+
+numpy is used for vectorized scoring when installed; without it the
+pure-Python fallback is measured (use a smaller --chunks).
+"""
+
+import argparse
+import itertools
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.embeddings import hashing_embed, tokenize  # noqa: E402
+from app.services.retrieval import KnowledgeIndex, np  # noqa: E402
+
+DOMAIN_TERMS = (
+    "aml kyc sar cdd edd bnpl pii residency regulator circular sama cbuae dfsa adgm customer transaction "
+    "threshold reporting disclosure consumer protection capital reserves onboarding biometric verification "
+    "screening sanctions fintech operator license outsourcing cloud incident breach notification audit"
+).split()
+EXACT_TERMS = ["aed 500,000", "circular 123", "sar", "cbuae/2024-07", "article 14.3"]
+
+# (query, term every top hit must contain)
+EXACT_QUERIES = [
+    ("what does circular 123 say", "123"),
+    ("cbuae/2024-07 requirements", "cbuae/2024-07"),
+    ("AED 500,000 threshold", "500,000"),
+    ("article 14.3 obligations", "14.3"),
+]
+
+
+def build_vocabulary(size: int = 20000) -> list:
+    """Domain terms plus filler words; sampled with Zipf-like weights like natural text."""
+    return DOMAIN_TERMS + [f"w{i}" for i in range(size - len(DOMAIN_TERMS))]
+
+
+def synthetic_chunks(count: int, vocabulary: list, words_per_chunk: int = 120):
+    rng = random.Random(42)
+    cum_weights = list(itertools.accumulate(1.0 / (rank + 1) for rank in range(len(vocabulary))))
+    shuffled = vocabulary[:]
+    rng.shuffle(shuffled)
+    for chunk_id in range(count):
+        words = rng.choices(shuffled, cum_weights=cum_weights, k=words_per_chunk)
+        if chunk_id % 997 == 0:
+            words.insert(rng.randrange(len(words)), rng.choice(EXACT_TERMS))
+        text = " ".join(words)
+        yield chunk_id, text, hashing_embed(text).tobytes(), f"doc{chunk_id // 50}.md"
+
+
+def check_exact_terms(index, k: int = 3) -> bool:
+    """Regression check: exact-term queries must not be diluted by vector-only hits."""
+    ok = True
+    for query, term in EXACT_QUERIES:
+        hits = index.hybrid_search(query, k=k)
+        found = [term in tokenize(hit["text"]) for hit in hits]
+        ok &= all(found)
+        print(f"{'ok' if all(found) else 'FAIL':<6}{query!r}: {sum(found)}/{len(hits)} top hits contain {term!r}")
+    return ok
+
+
+def measure(fn, queries) -> list:
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        fn(query, k=5)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=100000, help="Number of synthetic chunks")
+    parser.add_argument("--queries", type=int, default=200, help="Number of queries per mode")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    vocabulary = build_vocabulary()
+    index = KnowledgeIndex.from_chunks(synthetic_chunks(args.chunks, vocabulary))
+    print(f"Built index: {len(index)} chunks in {time.perf_counter() - start:.1f}s (numpy: {np is not None})")
+    if not check_exact_terms(index):
+        sys.exit(1)
+
+    rng = random.Random(7)
+    queries = [
+        f"{rng.choice(EXACT_TERMS)} {rng.choice(DOMAIN_TERMS)} {rng.choice(DOMAIN_TERMS)}" for _ in range(args.queries)
+    ]
+
+    print(f"{'mode':<10}{'p50':>10}{'p95':>10}{'max':>10}  (ms per query)")
+    for name, fn in [
+        ("bm25", index.lexical_search),
+        ("vector", index.vector_search),
+        ("hybrid", index.hybrid_search),
+    ]:
+        timings = sorted(measure(fn, queries))
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        print(f"{name:<10}{statistics.median(timings):>10.3f}{p95:>10.3f}{timings[-1]:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Serialization Benchmark: Per-Row Cost of the /alerts and /reports List Path
+
+Compares, over the same page of rows from a throwaway SQLite database:
+- before: ORM objects -> Pydantic validation (from_attributes) ->
+  jsonable_encoder -> stdlib json (what FastAPI does for a response_model)
+- after: column tuples -> dicts -> orjson (or compact stdlib json)
+
+Usage:
+    python benchmarks/serialization.py [--rows 5000] [--page 500] [--repeat 20]
+
+Reported times include the database query, since skipping ORM object
+construction is part of the saving.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_tmp = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp.name}/bench.db"
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+from app.models.database import SessionLocal, ComplianceAlert, GeneratedReport, init_db  # noqa: E402
+from app.models.schemas import ComplianceAlertResponse, GeneratedReportResponse  # noqa: E402
+from app.services.serialization import dumps, model_columns, orjson, rows_to_dicts  # noqa: E402
+
+
+def populate(rows: int):
+    start = datetime.utcnow() - timedelta(days=30)
+    db = SessionLocal()
+    try:
+        db.bulk_insert_mappings(ComplianceAlert, [
+            {
+                "summary": f"Circular {i}: updated customer due diligence thresholds for BNPL operators",
+                "impact_json": {
+                    "impact": ("High", "Medium", "Low")[i % 3],
+                    "analysis": "Operators must re-verify customers above AED 500,000 within 30 days. " * 3,
+                    "affected_areas": ["KYC", "Onboarding", "Reporting"],
+                },
+                "action_required": i % 4 != 0,
+                "created_at": start + timedelta(minutes=2 * i),
+            }
+            for i in range(rows)
+        ])
+        db.bulk_insert_mappings(GeneratedReport, [
+            {
+                "alert_id": i + 1,
+                "status": "completed",
+                "title": f"Compliance Report for Alert {i + 1}",
+                "content_markdown": "# Executive Summary\n\n" + "Gap analysis paragraph. " * 150,
+                "created_at": start + timedelta(minutes=2 * i + 1),
+            }
+            for i in range(rows)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+
+def before(model, orm_class, page: int) -> bytes:
+    db = SessionLocal()
+    try:
+        objects = db.query(orm_class).limit(page).all()
+        validated = TypeAdapter(List[model]).validate_python(objects, from_attributes=True)
+        return json.dumps(jsonable_encoder(validated), ensure_ascii=False, separators=(",", ":")).encode()
+    finally:
+        db.close()
+
+
+def after(model, orm_class, page: int) -> bytes:
+    db = SessionLocal()
+    try:
+        rows = db.query(*model_columns(model, orm_class)).limit(page).all()
+        return dumps(rows_to_dicts(model, rows))
+    finally:
+        db.close()
+
+
+def measure(fn, model, orm_class, page: int, repeat: int) -> float:
+    """Median microseconds per row."""
+    fn(model, orm_class, page)  # warm up
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(model, orm_class, page)
+        timings.append((time.perf_counter() - start) * 1e6 / page)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000, help="Alerts and reports to insert")
+    parser.add_argument("--page", type=int, default=500, help="Rows per simulated response")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed repetitions per path")
+    args = parser.parse_args()
+
+    init_db()
+    populate(args.rows)
+    page = min(args.page, args.rows)
+    print(f"{page} rows per response (orjson: {orjson is not None})")
+    print(f"{'endpoint':<10}{'before':>12}{'after':>12}{'speedup':>10}  (µs per row)")
+    for name, model, orm_class in [
+        ("alerts", ComplianceAlertResponse, ComplianceAlert),
+        ("reports", GeneratedReportResponse, GeneratedReport),
+    ]:
+        assert json.loads(before(model, orm_class, page)) == json.loads(after(model, orm_class, page))
+        slow = measure(before, model, orm_class, page, args.repeat)
+        fast = measure(after, model, orm_class, page, args.repeat)
+        print(f"{name:<10}{slow:>12.2f}{fast:>12.2f}{slow / fast:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Startup Benchmark: Import Time & First-Request Latency
+
+Measures, in fresh interpreter processes:
+- Time to import the FastAPI app (`import main`)
+- Time to run the lifespan startup (schema creation, scheduler start)
+- Latency of the first request to a few endpoints
+
+Usage:
+    python benchmarks/startup.py [--runs 5]
+
+Each run uses a throwaway SQLite database so results are not affected by
+existing data. Requires fastapi's TestClient (httpx) to be installed.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs inside a fresh interpreter; prints a single JSON line with timings
+_CHILD_SCRIPT = r"""
+import json, time
+t0 = time.perf_counter()
+import main
+t_import = time.perf_counter() - t0
+
+from fastapi.testclient import TestClient
+
+timings = {"import_ms": t_import * 1000}
+t0 = time.perf_counter()
+with TestClient(main.app) as client:
+    timings["startup_ms"] = (time.perf_counter() - t0) * 1000
+    credentials = {"email": "bench@example.com", "password": "bench-password"}
+    client.post("/api/v1/register", json=credentials)
+    t0 = time.perf_counter()
+    token = client.post("/api/v1/login", json=credentials).json()["access_token"]
+    timings["first_login_ms"] = (time.perf_counter() - t0) * 1000
+    client.headers["Authorization"] = f"Bearer {token}"
+    for name, method, path, body in [
+        ("first_health_ms", "get", "/health", None),
+        ("first_alerts_ms", "get", "/api/v1/alerts", None),
+        ("first_chat_ms", "post", "/api/v1/chat", {"query": "What are KYC requirements?"}),
+    ]:
+        t0 = time.perf_counter()
+        getattr(client, method)(path, json=body) if body else getattr(client, method)(path)
+        timings[name] = (time.perf_counter() - t0) * 1000
+print(json.dumps(timings))
+"""
+
+
+def run_once() -> dict:
+    """Runs the child script once against a temporary database."""
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ)
+        env["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        result = subprocess.run(
+            [sys.executable, "-c", _CHILD_SCRIPT],
+            cwd=REPO_ROOT,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Number of fresh-process runs")
+    args = parser.parse_args()
+
+    samples = [run_once() for _ in range(args.runs)]
+
+    print(f"{'metric':<20}{'median':>10}{'min':>10}{'max':>10}  (ms, {args.runs} runs)")
+    for metric in samples[0]:
+        values = [sample[metric] for sample in samples]
+        print(f"{metric:<20}{statistics.median(values):>10.1f}{min(values):>10.1f}{max(values):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
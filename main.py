@@ -20,8 +20,10 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 # Import modules
-from app.services import start_watchtower_scheduler, stop_watchtower_scheduler
-from app.routes import auth, alerts, reports, chat
+from app.models import init_db
+from app.services.search import init_search_index
+from app.services import start_watchtower_scheduler, stop_watchtower_scheduler, ProfilingMiddleware, init_stats
+from app.routes import auth, alerts, reports, chat, admin, knowledge, search, stats, export
 
 # Logging setup
 logging.basicConfig(level=logging.INFO)
@@ -36,10 +38,14 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     """
     Lifecycle manager for FastAPI app.
-    Starts background scheduler on startup, stops on shutdown.
+    Creates the database schema, full-text index and dashboard aggregates
+    and starts the background scheduler on startup, stops the scheduler on shutdown.
     """
     # Startup
     logger.info("🚀 CompliOps Backend Starting...")
+    init_db()
+    init_search_index()
+    init_stats()
     start_watchtower_scheduler()
     yield
     
@@ -68,6 +74,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Opt-in request profiling (X-Profile header or PROFILE_SAMPLE_RATE)
+app.add_middleware(ProfilingMiddleware)
+
 
 # ============================================================================
 # REGISTER ROUTE ROUTERS
@@ -77,6 +86,11 @@ app.include_router(auth.router)
 app.include_router(alerts.router)
 app.include_router(reports.router)
 app.include_router(chat.router)
+app.include_router(knowledge.router)
+app.include_router(search.router)
+app.include_router(stats.router)
+app.include_router(export.router)
+app.include_router(admin.router)
 
 
 # ============================================================================
@@ -87,15 +101,17 @@ app.include_router(chat.router)
 async def health_check():
     """
     Health check endpoint.
-    Returns API status and configuration info.
+    Returns API status, configuration info and LLM circuit breaker state.
     """
     from app.config import GEMINI_API_KEY
+    from app.services.llm import llm_breaker
     
     return {
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
         "api_key_configured": bool(GEMINI_API_KEY),
         "mode": "Production" if GEMINI_API_KEY else "Mock",
+        "llm_circuit": llm_breaker.snapshot(),
         "version": "1.0.0",
     }
 